@@ -1,7 +1,7 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import uvicorn
 
 from routers import health, auth, preferences, matches, voice, data_collection, calendar
@@ -23,7 +23,8 @@ app = FastAPI(
     title="GlowGo",
     description="AI-powered beauty/wellness service marketplace",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS Middleware - Allow localhost and production domains
@@ -7,8 +7,10 @@ from config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=5,         # Number of connections to maintain
-    max_overflow=10      # Maximum number of connections to create beyond pool_size
+    pool_size=10,        # Number of connections to maintain
+    max_overflow=20,     # Maximum number of connections to create beyond pool_size
+    pool_recycle=1800,   # Replace connections older than 30 minutes before the server drops them
+    pool_timeout=5       # Fail fast instead of queueing when the pool is exhausted
 )
 
 # Session factory
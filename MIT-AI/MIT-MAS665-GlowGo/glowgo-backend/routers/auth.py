@@ -20,6 +20,7 @@ from utils.auth import (
     generate_jwt_token,
     get_current_user
 )
+from services.tools.calendar_tools import invalidate_access_token
 
 
 router = APIRouter(tags=["authentication"])
@@ -104,6 +105,7 @@ async def google_login(
             
             db.commit()
             db.refresh(user)
+            invalidate_access_token(user.id)
             
         else:
             # Step 3b: Create new user
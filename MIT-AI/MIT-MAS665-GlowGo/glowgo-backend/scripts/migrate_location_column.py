@@ -1,6 +1,11 @@
 """
-Migration script to increase location column size from VARCHAR(100) to VARCHAR(255)
+Migration script to lift the location column limit from VARCHAR(100) to 255 characters
 Run this script once to update the database schema.
+
+The column becomes TEXT (a catalog-only change from VARCHAR, no table rewrite)
+with the 255-character limit enforced by a CHECK constraint that is added
+NOT VALID and validated separately, so existing rows are scanned without
+blocking concurrent reads and writes.
 """
 
 import sys
@@ -13,29 +18,75 @@ from sqlalchemy import text
 from models.database import engine
 
 
+def _run_step(conn, description: str, statement: str):
+    """Run one DDL statement in its own short transaction"""
+    try:
+        # Fail fast instead of queueing behind long-running transactions on a busy table
+        conn.execute(text("SET LOCAL lock_timeout = '2s';"))
+        conn.execute(text(statement))
+        conn.commit()
+        print(f"  {description}: done")
+    except Exception:
+        conn.rollback()
+        raise
+
+
 def migrate():
     """Increase location column size to support longer place-based locations"""
     print("Starting migration: Increasing location column size...")
 
     with engine.connect() as conn:
         try:
-            # PostgreSQL syntax for altering column type
-            conn.execute(text("""
-                ALTER TABLE preference_sessions
-                ALTER COLUMN location TYPE VARCHAR(255);
-            """))
+            # Inspect the current state first so re-runs don't take any locks
+            column = conn.execute(text("""
+                SELECT character_maximum_length
+                FROM information_schema.columns
+                WHERE table_name = 'preference_sessions'
+                  AND column_name = 'location';
+            """)).fetchone()
+
+            if column is None:
+                print("Table doesn't exist yet. Will be created with correct size on first run.")
+                return
+
+            constraint = conn.execute(text("""
+                SELECT convalidated
+                FROM pg_constraint
+                WHERE conname = 'location_len'
+                  AND conrelid = 'preference_sessions'::regclass;
+            """)).fetchone()
             conn.commit()
-            print("Migration successful: location column is now VARCHAR(255)")
+
+            # Step 1: VARCHAR(n) -> TEXT is a catalog-only change in PostgreSQL
+            if column[0] is not None:
+                _run_step(conn, "Convert location to TEXT", """
+                    ALTER TABLE preference_sessions
+                    ALTER COLUMN location TYPE TEXT;
+                """)
+
+            # Step 2: add the length limit without scanning existing rows
+            if constraint is None:
+                _run_step(conn, "Add location_len constraint", """
+                    ALTER TABLE preference_sessions
+                    ADD CONSTRAINT location_len CHECK (char_length(location) <= 255) NOT VALID;
+                """)
+
+            # Step 3: validate existing rows under SHARE UPDATE EXCLUSIVE
+            if constraint is None or not constraint[0]:
+                _run_step(conn, "Validate location_len constraint", """
+                    ALTER TABLE preference_sessions
+                    VALIDATE CONSTRAINT location_len;
+                """)
+
+            print("Migration successful: location column is TEXT limited to 255 characters")
         except Exception as e:
             print(f"Migration error: {e}")
-            # Column might already be the right size, or table doesn't exist yet
-            if "does not exist" in str(e).lower():
-                print("Table doesn't exist yet. Will be created with correct size on first run.")
-            elif "already" in str(e).lower() or "nothing to alter" in str(e).lower():
-                print("Column is already the correct size.")
-            else:
-                raise
+            raise
 
 
 if __name__ == "__main__":
-    migrate()
+    try:
+        migrate()
+    finally:
+        # Release pooled connections so the short-lived script exits cleanly
+        engine.dispose()
@@ -5,6 +5,7 @@ Uses CrewAI framework with specialized availability tools
 
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
+import asyncio
 from crewai import Agent
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -20,6 +21,10 @@ from services.tools.availability_tools import (
 )
 
 
+# Upper bound on candidates checked at once (each holds a pooled DB connection)
+_MAX_CONCURRENT_CHECKS = 16
+
+
 class AvailabilityAgent:
     """
     Real-time Availability Expert
@@ -87,225 +92,287 @@ class AvailabilityAgent:
             }
         """
         try:
-            # Create database session
-            db_session = SessionLocal()
+            print(f"📅 Availability Agent: Checking {len(candidates)} candidates")
+            print(f"   Service duration: {service_duration} minutes")
+            print(f"   Time urgency: {time_urgency}")
+
+            # Determine date range based on urgency
+            date_range = self._get_date_range(time_urgency, preferred_date)
+
+            # Check candidates concurrently; each check runs on its own thread and DB session
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CHECKS)
+
+            async def check_one(candidate: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    return await self.check_single(
+                        candidate,
+                        date_range=date_range,
+                        preferred_date=preferred_date,
+                        preferred_time=preferred_time,
+                        time_constraint=time_constraint,
+                        service_duration=service_duration,
+                        user_timezone=user_timezone
+                    )
 
-            try:
-                print(f"📅 Availability Agent: Checking {len(candidates)} candidates")
-                print(f"   Service duration: {service_duration} minutes")
-                print(f"   Time urgency: {time_urgency}")
+            results = await asyncio.gather(
+                *(check_one(candidate) for candidate in candidates),
+                return_exceptions=True
+            )
 
-                # Determine date range based on urgency
-                date_range = self._get_date_range(time_urgency, preferred_date)
+            candidates_with_slots = []
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"   ⚠️  Availability check failed: {result}")
+                elif result:
+                    candidates_with_slots.append(result)
 
-                candidates_with_slots = []
-                total_slots = 0
+            total_slots = sum(c["slots_count"] for c in candidates_with_slots)
 
-                # Process each candidate
-                for candidate in candidates:
-                    provider_id = candidate.get("provider_id") or candidate.get("id")
-                    provider_name = candidate.get("provider_name") or candidate.get("business_name")
+            # Sort candidates by number of available slots (most slots first)
+            candidates_with_slots.sort(
+                key=lambda x: x.get("slots_count", 0),
+                reverse=True
+            )
 
-                    if not provider_id:
-                        continue
+            print(f"\n📊 Availability Summary:")
+            print(f"   Providers with availability: {len(candidates_with_slots)}")
+            print(f"   Total available slots: {total_slots}")
 
-                    print(f"\n🔍 Checking availability for: {provider_name}")
+            # Build slots per provider map
+            slots_per_provider = {
+                c["provider_id"]: c["slots_count"]
+                for c in candidates_with_slots
+            }
 
-                    # Step 1: Query calendar
-                    print(f"   Step 1: Querying calendar...")
-                    calendar_result = calendar_query_tool.execute({
-                        "provider_id": provider_id,
-                        "date_range": date_range,
-                        "db_session": db_session
-                    })
+            return {
+                "candidates_with_slots": candidates_with_slots,
+                "available_slots_per_provider": slots_per_provider,
+                "providers_available": len(candidates_with_slots),
+                "slots_available": total_slots,
+                "status": "success" if candidates_with_slots else "no_availability",
+                "message": (
+                    f"Found {total_slots} available slots across {len(candidates_with_slots)} providers"
+                    if candidates_with_slots
+                    else "No availability found for the selected criteria"
+                )
+            }
 
-                    available_slots = calendar_result.get("available_slots", [])
-                    booked_times = calendar_result.get("booked_times", [])
+        except Exception as e:
+            print(f"AvailabilityAgent execution error: {e}")
+            import traceback
+            traceback.print_exc()
 
-                    print(f"   Found {len(available_slots)} potential slots")
-                    print(f"   Booked times: {len(booked_times)}")
+            # Fallback response
+            return {
+                "candidates_with_slots": [],
+                "available_slots_per_provider": {},
+                "providers_available": 0,
+                "slots_available": 0,
+                "status": "error",
+                "message": f"Error checking availability: {str(e)}"
+            }
 
-                    # Step 2: Check working hours
-                    print(f"   Step 2: Checking working hours...")
-                    hours_result = working_hours_checker_tool.execute({
-                        "provider_id": provider_id,
-                        "db_session": db_session
-                    })
+    async def check_single(
+        self,
+        candidate: Dict[str, Any],
+        date_range: Dict[str, str],
+        preferred_date: Optional[str] = None,
+        preferred_time: Optional[str] = None,
+        time_constraint: Optional[str] = None,
+        service_duration: int = 30,
+        user_timezone: str = "America/New_York"
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Check availability for a single candidate
 
-                    working_hours = hours_result.get("hours", {})
-                    provider_tz = hours_result.get("timezone", "America/New_York")
+        Runs the blocking calendar/DB tools on a worker thread with a dedicated
+        session so multiple candidates can be checked concurrently.
 
-                    print(f"   Timezone: {provider_tz}")
+        Returns:
+            dict: Candidate info with available slots, or None if none are free
+        """
+        return await asyncio.to_thread(
+            self._check_candidate,
+            candidate,
+            date_range,
+            preferred_date,
+            preferred_time,
+            time_constraint,
+            service_duration,
+            user_timezone
+        )
 
-                    # Step 3: Filter slots by working hours
-                    filtered_slots = self._filter_by_working_hours(
-                        available_slots,
-                        working_hours
-                    )
+    def _check_candidate(
+        self,
+        candidate: Dict[str, Any],
+        date_range: Dict[str, str],
+        preferred_date: Optional[str],
+        preferred_time: Optional[str],
+        time_constraint: Optional[str],
+        service_duration: int,
+        user_timezone: str
+    ) -> Optional[Dict[str, Any]]:
+        """Blocking per-candidate availability pipeline (calendar, hours, slots, conflicts)"""
+        db_session = SessionLocal()
 
-                    print(f"   After working hours filter: {len(filtered_slots)} slots")
+        try:
+            provider_id = candidate.get("provider_id") or candidate.get("id")
+            provider_name = candidate.get("provider_name") or candidate.get("business_name")
 
-                    # Step 4: Find slots with sufficient duration
-                    print(f"   Step 3: Finding slots with {service_duration} min duration...")
-                    slot_result = slot_finder_tool.execute({
-                        "preferred_date": preferred_date or "any",
-                        "preferred_time": preferred_time,
-                        "time_constraint": time_constraint,
-                        "service_duration": service_duration,
-                        "available_slots": filtered_slots
-                    })
+            if not provider_id:
+                return None
 
-                    matching_slots = slot_result.get("matching_slots", [])
-
-                    print(f"   Slots with sufficient duration: {len(matching_slots)}")
-
-                    # Step 5: Prevent double-bookings
-                    print(f"   Step 4: Validating against double-bookings...")
-                    validated_slots = []
-
-                    for slot in matching_slots:
-                        prevention_result = double_booking_preventor_tool.execute({
-                            "slot": slot.get("datetime"),
-                            "service_duration": service_duration,
-                            "all_bookings": booked_times
-                        })
-
-                        if prevention_result.get("is_available"):
-                            validated_slots.append(slot)
-
-                    print(f"   ✅ {len(validated_slots)} conflict-free slots")
-
-                    # Step 6: Convert to user's timezone if different
-                    user_tz_slots = []
-                    for slot in validated_slots:
-                        if provider_tz != user_timezone:
-                            tz_result = timezone_converter_tool.execute({
-                                "provider_tz": provider_tz,
-                                "user_tz": user_timezone,
-                                "time": slot.get("datetime")
-                            })
-                            slot["user_timezone_time"] = tz_result.get("user_time")
-                            slot["timezone_offset"] = tz_result.get("offset_hours")
-                        else:
-                            slot["user_timezone_time"] = slot.get("datetime")
-                            slot["timezone_offset"] = 0
-
-                        user_tz_slots.append(slot)
-
-                    # Step 7: Suggest alternatives if preferred time not available
-                    alternatives = []
-                    if preferred_time and user_tz_slots:
-                        # Combine preferred date and time
-                        if preferred_date:
-                            preferred_datetime = f"{preferred_date}T{preferred_time}"
-                        else:
-                            # Use today
-                            preferred_datetime = f"{datetime.now().date().isoformat()}T{preferred_time}"
-
-                        alt_result = alternative_suggester_tool.execute({
-                            "preferred_time": preferred_datetime,
-                            "available_slots": user_tz_slots,
-                            "max_alternatives": 5
-                        })
-
-                        alternatives = alt_result.get("alternatives", [])
-
-                    # Build candidate result
-                    if user_tz_slots:
-                        candidate_info = {
-                            "provider_id": provider_id,
-                            "provider_name": provider_name,
-                            "available_slots": [
-                                {
-                                    "datetime": s.get("datetime"),
-                                    "date": s.get("date"),
-                                    "time": s.get("time"),
-                                    "end_time": s.get("end_time"),
-                                    "user_time": s.get("user_timezone_time")
-                                }
-                                for s in user_tz_slots[:10]  # Limit to 10 slots
-                            ],
-                            "slots_count": len(user_tz_slots),
-                            "working_hours": self._format_working_hours(working_hours),
-                            "timezone": provider_tz,
-                            "user_timezone": user_timezone,
-                            "alternatives": alternatives[:3] if alternatives else [],
-                            # Include original candidate data
-                            "service_id": candidate.get("service_id"),
-                            "service_name": candidate.get("service_name"),
-                            "price": candidate.get("price"),
-                            "rating": candidate.get("rating"),
-                            "distance": candidate.get("distance"),
-                            "distance_miles": candidate.get("distance"),
-                            "match_score": candidate.get("match_score"),
-                            "review_count": candidate.get("review_count", 0),
-                            "is_verified": candidate.get("is_verified", False),
-                            "city": candidate.get("city", ""),
-                            "state": candidate.get("state", ""),
-                            # Enhanced fields for real provider data
-                            "photo_url": candidate.get("photo_url", ""),
-                            "photos": candidate.get("photos", []),
-                            "address": candidate.get("address", ""),
-                            "phone": candidate.get("phone", ""),
-                            "price_range": candidate.get("price_range", ""),
-                            "specialties": candidate.get("specialties", []),
-                            "stylist_names": candidate.get("stylist_names", []),
-                            "booking_url": candidate.get("booking_url", ""),
-                            "yelp_url": candidate.get("yelp_url", ""),
-                            "bio": candidate.get("bio", "")
-                        }
-
-                        candidates_with_slots.append(candidate_info)
-                        total_slots += len(user_tz_slots)
-
-                # Sort candidates by number of available slots (most slots first)
-                candidates_with_slots.sort(
-                    key=lambda x: x.get("slots_count", 0),
-                    reverse=True
-                )
+            print(f"\n🔍 Checking availability for: {provider_name}")
 
-                print(f"\n📊 Availability Summary:")
-                print(f"   Providers with availability: {len(candidates_with_slots)}")
-                print(f"   Total available slots: {total_slots}")
+            # Step 1: Query calendar
+            print(f"   Step 1: Querying calendar...")
+            calendar_result = calendar_query_tool.execute({
+                "provider_id": provider_id,
+                "date_range": date_range,
+                "db_session": db_session
+            })
 
-                # Build slots per provider map
-                slots_per_provider = {
-                    c["provider_id"]: c["slots_count"]
-                    for c in candidates_with_slots
-                }
+            available_slots = calendar_result.get("available_slots", [])
+            booked_times = calendar_result.get("booked_times", [])
 
-                return {
-                    "candidates_with_slots": candidates_with_slots,
-                    "available_slots_per_provider": slots_per_provider,
-                    "providers_available": len(candidates_with_slots),
-                    "slots_available": total_slots,
-                    "status": "success" if candidates_with_slots else "no_availability",
-                    "message": (
-                        f"Found {total_slots} available slots across {len(candidates_with_slots)} providers"
-                        if candidates_with_slots
-                        else "No availability found for the selected criteria"
-                    )
-                }
+            print(f"   Found {len(available_slots)} potential slots")
+            print(f"   Booked times: {len(booked_times)}")
 
-            finally:
-                # Always close the session
-                db_session.close()
+            # Step 2: Check working hours
+            print(f"   Step 2: Checking working hours...")
+            hours_result = working_hours_checker_tool.execute({
+                "provider_id": provider_id,
+                "db_session": db_session
+            })
 
-        except Exception as e:
-            print(f"AvailabilityAgent execution error: {e}")
-            import traceback
-            traceback.print_exc()
+            working_hours = hours_result.get("hours", {})
+            provider_tz = hours_result.get("timezone", "America/New_York")
 
-            # Fallback response
+            print(f"   Timezone: {provider_tz}")
+
+            # Step 3: Filter slots by working hours
+            filtered_slots = self._filter_by_working_hours(
+                available_slots,
+                working_hours
+            )
+
+            print(f"   After working hours filter: {len(filtered_slots)} slots")
+
+            # Step 4: Find slots with sufficient duration
+            print(f"   Step 3: Finding slots with {service_duration} min duration...")
+            slot_result = slot_finder_tool.execute({
+                "preferred_date": preferred_date or "any",
+                "preferred_time": preferred_time,
+                "time_constraint": time_constraint,
+                "service_duration": service_duration,
+                "available_slots": filtered_slots
+            })
+
+            matching_slots = slot_result.get("matching_slots", [])
+
+            print(f"   Slots with sufficient duration: {len(matching_slots)}")
+
+            # Step 5: Prevent double-bookings
+            print(f"   Step 4: Validating against double-bookings...")
+            validated_slots = []
+
+            for slot in matching_slots:
+                prevention_result = double_booking_preventor_tool.execute({
+                    "slot": slot.get("datetime"),
+                    "service_duration": service_duration,
+                    "all_bookings": booked_times
+                })
+
+                if prevention_result.get("is_available"):
+                    validated_slots.append(slot)
+
+            print(f"   ✅ {len(validated_slots)} conflict-free slots")
+
+            # Step 6: Convert to user's timezone if different
+            user_tz_slots = []
+            for slot in validated_slots:
+                if provider_tz != user_timezone:
+                    tz_result = timezone_converter_tool.execute({
+                        "provider_tz": provider_tz,
+                        "user_tz": user_timezone,
+                        "time": slot.get("datetime")
+                    })
+                    slot["user_timezone_time"] = tz_result.get("user_time")
+                    slot["timezone_offset"] = tz_result.get("offset_hours")
+                else:
+                    slot["user_timezone_time"] = slot.get("datetime")
+                    slot["timezone_offset"] = 0
+
+                user_tz_slots.append(slot)
+
+            # Step 7: Suggest alternatives if preferred time not available
+            alternatives = []
+            if preferred_time and user_tz_slots:
+                # Combine preferred date and time
+                if preferred_date:
+                    preferred_datetime = f"{preferred_date}T{preferred_time}"
+                else:
+                    # Use today
+                    preferred_datetime = f"{datetime.now().date().isoformat()}T{preferred_time}"
+
+                alt_result = alternative_suggester_tool.execute({
+                    "preferred_time": preferred_datetime,
+                    "available_slots": user_tz_slots,
+                    "max_alternatives": 5
+                })
+
+                alternatives = alt_result.get("alternatives", [])
+
+            if not user_tz_slots:
+                return None
+
+            # Build candidate result
             return {
-                "candidates_with_slots": [],
-                "available_slots_per_provider": {},
-                "providers_available": 0,
-                "slots_available": 0,
-                "status": "error",
-                "message": f"Error checking availability: {str(e)}"
+                "provider_id": provider_id,
+                "provider_name": provider_name,
+                "available_slots": [
+                    {
+                        "datetime": s.get("datetime"),
+                        "date": s.get("date"),
+                        "time": s.get("time"),
+                        "end_time": s.get("end_time"),
+                        "user_time": s.get("user_timezone_time")
+                    }
+                    for s in user_tz_slots[:10]  # Limit to 10 slots
+                ],
+                "slots_count": len(user_tz_slots),
+                "working_hours": self._format_working_hours(working_hours),
+                "timezone": provider_tz,
+                "user_timezone": user_timezone,
+                "alternatives": alternatives[:3] if alternatives else [],
+                # Include original candidate data
+                "service_id": candidate.get("service_id"),
+                "service_name": candidate.get("service_name"),
+                "price": candidate.get("price"),
+                "rating": candidate.get("rating"),
+                "distance": candidate.get("distance"),
+                "distance_miles": candidate.get("distance"),
+                "match_score": candidate.get("match_score"),
+                "review_count": candidate.get("review_count", 0),
+                "is_verified": candidate.get("is_verified", False),
+                "city": candidate.get("city", ""),
+                "state": candidate.get("state", ""),
+                # Enhanced fields for real provider data
+                "photo_url": candidate.get("photo_url", ""),
+                "photos": candidate.get("photos", []),
+                "address": candidate.get("address", ""),
+                "phone": candidate.get("phone", ""),
+                "price_range": candidate.get("price_range", ""),
+                "specialties": candidate.get("specialties", []),
+                "stylist_names": candidate.get("stylist_names", []),
+                "booking_url": candidate.get("booking_url", ""),
+                "yelp_url": candidate.get("yelp_url", ""),
+                "bio": candidate.get("bio", "")
             }
 
+        finally:
+            db_session.close()
+
     def _get_date_range(
         self,
         time_urgency: str,
@@ -399,13 +399,11 @@ class ConversationAgent:
                 
                 # 2. Update database
                 saved_count = 0
-                for provider in providers:
-                    try:
-                        # Run synchronous storage tool in thread
-                        await asyncio.to_thread(merchant_storage_tool._run, provider)
-                        saved_count += 1
-                    except Exception as e:
-                        print(f"Error saving provider {provider.get('business_name')}: {e}")
+                try:
+                    # Store the whole batch in one transaction, in a worker thread
+                    saved_count = await asyncio.to_thread(merchant_storage_tool.store_many, providers)
+                except Exception as e:
+                    print(f"Error saving providers: {e}")
                         
                 print(f"[ConversationAgent] Saved/Updated {saved_count} providers to database")
 
@@ -3,6 +3,8 @@ Ranking Agent - The Core Matching Agent
 Intelligently scores and ranks providers based on multiple factors
 """
 from typing import Dict, List, Any, Optional
+import heapq
+from operator import itemgetter
 from crewai import Agent, Task
 from services.tools.ranking_tools import (
     distance_calculator_tool,
@@ -283,7 +285,8 @@ class RankingAgent:
         self,
         candidates: List[Dict[str, Any]],
         user_preferences: Dict[str, Any],
-        user_location: Optional[Dict[str, float]] = None
+        user_location: Optional[Dict[str, float]] = None,
+        top_k: Optional[int] = 10
     ) -> Dict[str, Any]:
         """
         Execute ranking agent to score and rank candidates
@@ -292,6 +295,7 @@ class RankingAgent:
             candidates: List of provider candidates with availability
             user_preferences: User preferences including budget, etc.
             user_location: User location coordinates (optional)
+            top_k: Return only the best K providers (None for all, fully sorted)
 
         Returns:
             dict: {
@@ -301,13 +305,13 @@ class RankingAgent:
         """
         try:
             ranked_providers = []
+            budget_max = user_preferences.get("budget_max", 999999)
 
             # Simple scoring without complex tools for now
-            for i, candidate in enumerate(candidates[:10]):
+            for candidate in candidates:
                 # Calculate simple scores
                 rating = candidate.get("rating", 0)
                 price = candidate.get("price", 0)
-                budget_max = user_preferences.get("budget_max", 999999)
 
                 # Rating score (0-1)
                 rating_score = rating / 5.0
@@ -355,8 +359,12 @@ class RankingAgent:
                     "recommendation_reason": ", ".join(explanation_parts) if explanation_parts else "Good match"
                 })
 
-            # Sort by overall score
-            ranked_providers.sort(key=lambda x: x["overall_score"], reverse=True)
+            # Sort by overall score; a K-sized heap when only the top K are needed
+            by_score = itemgetter("overall_score")
+            if top_k is None:
+                ranked_providers.sort(key=by_score, reverse=True)
+            else:
+                ranked_providers = heapq.nlargest(top_k, ranked_providers, key=by_score)
 
             return {
                 "ranked_providers": ranked_providers,
@@ -369,7 +377,7 @@ class RankingAgent:
             traceback.print_exc()
 
             return {
-                "ranked_providers": candidates[:10] if candidates else [],
+                "ranked_providers": candidates[:top_k] if candidates else [],
                 "status": "error",
                 "error": str(e)
             }
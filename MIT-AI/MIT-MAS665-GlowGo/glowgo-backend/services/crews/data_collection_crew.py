@@ -16,6 +16,7 @@ from config import settings, crew_config
 from services.tools.data_collection_tools import (
     yelp_search_tool,
     yelp_details_tool,
+    yelp_details_many,
     brightdata_scraper_tool,
     merchant_storage_tool,
     data_collection_tools
@@ -151,8 +152,7 @@ class DataCollectionCrew:
                     "limit": limit_per_category
                 })
                 try:
-                    # Run synchronous tool in thread
-                    res = await asyncio.to_thread(yelp_search_tool._run, search_params)
+                    res = await yelp_search_tool._arun(search_params)
                     data = json.loads(res)
                     if "businesses" in data:
                         businesses = data["businesses"]
@@ -250,17 +250,19 @@ class DataCollectionCrew:
             # STEP 2.5: Enrich with Yelp business details (only for Yelp providers)
             # ======================================================================
             # Google providers already have hours from the search tool
-            for provider in unique_providers:
-                yelp_id = provider.get("yelp_id")
-                if yelp_id and not provider.get("business_hours"):
-                    try:
-                        details_raw = await asyncio.to_thread(yelp_details_tool._run, yelp_id)
-                        details = json.loads(details_raw)
-
-                        if isinstance(details, dict) and details.get("business_hours"):
-                            provider["business_hours"] = details["business_hours"]
-                    except Exception as e:
-                        logger.warning(f"Error fetching Yelp details for {yelp_id}: {e}")
+            to_enrich = [
+                provider for provider in unique_providers
+                if provider.get("yelp_id") and not provider.get("business_hours")
+            ]
+            details_list = await yelp_details_many([p["yelp_id"] for p in to_enrich])
+            for provider, details_raw in zip(to_enrich, details_list):
+                try:
+                    details = json.loads(details_raw)
+
+                    if isinstance(details, dict) and details.get("business_hours"):
+                        provider["business_hours"] = details["business_hours"]
+                except Exception as e:
+                    logger.warning(f"Error fetching Yelp details for {provider['yelp_id']}: {e}")
 
             # ======================================================================
             # STEP 3: Enhance with BrightData scraping
@@ -5,19 +5,272 @@ This crew manages the complete workflow from preference gathering through
 final ranking of service providers.
 """
 
-from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, Hashable, List, Optional, Tuple
+import asyncio
 import logging
+import operator
+import time
 
 from services.agents.conversation_agent import conversation_agent
 from services.agents.quality_assurance_agent import quality_assurance_agent
 from services.agents.matching_agent import matching_agent
 from services.agents.availability_agent import availability_agent
 from services.agents.ranking_agent import ranking_agent
+from services.tools.conversation_tools import readiness_detector_tool
+from services.tools.matching_tools import service_filter_tool, budget_filter_tool
 
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Number of ranked options returned to the user
+_TOP_K = 10
+
+# Replies that only confirm already-gathered preferences (no new information)
+_CONTINUE_MESSAGES = frozenset({
+    "", "yes", "yeah", "yep", "ok", "okay", "sure", "go ahead", "sounds good",
+    "continue", "search", "find matches", "show me", "let's go"
+})
+
+# Micro-batching: identical stage calls arriving within the window share one agent run
+_BATCH_MAX_SIZE = 8
+_BATCH_WINDOW_MS = 20
+
+
+# Candidate lookups repeat heavily for the same service/city, so keep them briefly
+_CANDIDATE_CACHE_TTL = 300
+_CANDIDATE_CACHE: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+_CANDIDATE_LOCKS: Dict[Tuple, asyncio.Lock] = {}
+
+
+async def _cached_lookup(
+    key: Tuple,
+    fetch: Callable[[], Awaitable[Dict[str, Any]]],
+    cacheable: Callable[[Dict[str, Any]], bool] = lambda result: True
+) -> Dict[str, Any]:
+    """Return a fresh cached result for key, or fetch it once per key (single-flight)"""
+    entry = _CANDIDATE_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _CANDIDATE_CACHE_TTL:
+        return entry[1]
+
+    lock = _CANDIDATE_LOCKS.get(key)
+    if lock is None:
+        lock = _CANDIDATE_LOCKS[key] = asyncio.Lock()
+
+    async with lock:
+        # Another request may have filled the entry while we waited
+        entry = _CANDIDATE_CACHE.get(key)
+        if entry is not None and time.monotonic() - entry[0] < _CANDIDATE_CACHE_TTL:
+            return entry[1]
+
+        try:
+            result = await fetch()
+        finally:
+            _CANDIDATE_LOCKS.pop(key, None)
+
+        if cacheable(result):
+            _CANDIDATE_CACHE[key] = (time.monotonic(), result)
+        return result
+
+
+def _candidate_cache_key(
+    preferences: Dict[str, Any],
+    user_location: Optional[Dict[str, float]],
+    max_distance: float
+) -> Tuple:
+    """Key on the fields MatchingAgent actually filters by"""
+    return (
+        "matching",
+        (preferences.get("service_type") or "").strip().lower(),
+        (preferences.get("location") or "").strip().lower(),
+        preferences.get("budget_min"),
+        preferences.get("budget_max"),
+        preferences.get("time_urgency", "flexible"),
+        (user_location.get("lat"), user_location.get("lon")) if user_location else None,
+        round(max_distance, 1)
+    )
+
+
+# Provider fields read when formatting ranked options, with their fallbacks
+_PROVIDER_DEFAULTS: Dict[str, Any] = {
+    "provider_id": None,
+    "provider_name": None,
+    "service_name": None,
+    "distance_miles": None,
+    "price": 0,
+    "rating": 0,
+    "review_count": 0,
+    "available_slots": (),
+    "recommendation_reason": "Great match for your needs",
+    "overall_score": 0,
+    "photo_url": "",
+    "photos": (),
+    "address": "",
+    "city": "",
+    "state": "",
+    "phone": "",
+    "price_range": "",
+    "specialties": (),
+    "stylist_names": (),
+    "booking_url": "",
+    "bio": "",
+    "yelp_url": ""
+}
+_PROVIDER_FIELDS = operator.itemgetter(*_PROVIDER_DEFAULTS)
+
+
+def _as_float(value: Any, default: float = 0.0) -> float:
+    """Coerce to float, skipping the constructor when it already is one"""
+    if type(value) is float:
+        return value
+    return float(value) if value is not None else default
+
+
+def _as_int(value: Any, default: int = 0) -> int:
+    """Coerce to int, skipping the constructor when it already is one"""
+    if type(value) is int:
+        return value
+    return int(value) if value is not None else default
+
+
+def _format_ranked_option(rank: int, provider: Dict[str, Any], service_type: Optional[str]) -> Dict[str, Any]:
+    """Shape one ranked provider into the ranked_options output schema"""
+    (
+        provider_id, provider_name, service_name, distance_miles, price, rating,
+        review_count, available_slots, recommendation_reason, overall_score,
+        photo_url, photos, address, city, state, phone, price_range,
+        specialties, stylist_names, booking_url, bio, yelp_url
+    ) = _PROVIDER_FIELDS({**_PROVIDER_DEFAULTS, **provider})
+
+    # Format available times as time strings (first 5 slots)
+    available_times = [
+        slot.get("time", slot.get("datetime", "")) if hasattr(slot, "get") else str(slot)
+        for slot in available_slots[:5]
+    ]
+
+    return {
+        "rank": rank,
+        "merchant_id": provider_id,
+        "merchant_name": provider_name,
+        "service_name": service_name,
+        "service_type": service_type,
+        "distance": round(distance_miles, 1) if distance_miles else None,
+        "price": _as_float(price),
+        "rating": _as_float(rating),
+        "reviews": _as_int(review_count),
+        "available_times": available_times,
+        "why_recommended": recommendation_reason,
+        "relevance_score": round(_as_float(overall_score) / 100, 2),  # Convert to 0-1 scale
+
+        # Enhanced fields for real provider data
+        "photo_url": photo_url,
+        "photos": photos,
+        "address": address,
+        "city": city,
+        "state": state,
+        "phone": phone,
+        "price_range": price_range,
+        "specialties": specialties,
+        "stylist_names": stylist_names,
+        "booking_url": booking_url,
+        "bio": bio,
+        "yelp_url": yelp_url
+    }
+
+
+@lru_cache(maxsize=1024)
+def _parse_preferred_date(preferred_date: str) -> date:
+    """Parse the YYYY-MM-DD prefix of a preferred date (values cluster around today)"""
+    return date.fromisoformat(preferred_date[:10])
+
+
+def _preferences_key(preferences: Dict[str, Any]) -> Tuple:
+    """Hashable, order-independent view of a preferences dict"""
+    return tuple(sorted((k, repr(v)) for k, v in preferences.items()))
+
+
+class _BatchingDispatcher:
+    """
+    Coalesces concurrent agent calls per stage.
+
+    Submissions are collected for up to _BATCH_WINDOW_MS (or _BATCH_MAX_SIZE
+    items), grouped by key, and each group runs its handler once with the
+    result fanned out to every waiting request.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]]):
+        self._handlers = handlers
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def submit(self, stage: str, key: Hashable, **kwargs) -> Dict[str, Any]:
+        """Queue a call for the given stage and wait for its (shared) result"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and workers are bound to the loop that created them
+            self._loop = loop
+            self._queues = {}
+            self._workers = {}
+
+        queue = self._queues.get(stage)
+        if queue is None:
+            queue = self._queues[stage] = asyncio.Queue()
+            self._workers[stage] = loop.create_task(self._drain(stage, queue))
+
+        future = loop.create_future()
+        queue.put_nowait((key, kwargs, future))
+        return await future
+
+    async def _drain(self, stage: str, queue: asyncio.Queue) -> None:
+        handler = self._handlers[stage]
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + _BATCH_WINDOW_MS / 1000
+
+            while len(batch) < _BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[Hashable, Tuple[Dict[str, Any], List[asyncio.Future]]] = {}
+            for key, kwargs, future in batch:
+                groups.setdefault(key, (kwargs, []))[1].append(future)
+
+            if len(groups) < len(batch) and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Coalesced %d %s calls into %d", len(batch), stage, len(groups))
+
+            await asyncio.gather(*(
+                self._run_group(handler, kwargs, futures)
+                for kwargs, futures in groups.values()
+            ))
+
+    @staticmethod
+    async def _run_group(
+        handler: Callable[..., Awaitable[Dict[str, Any]]],
+        kwargs: Dict[str, Any],
+        futures: List[asyncio.Future]
+    ) -> None:
+        try:
+            result = await handler(**kwargs)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future in futures:
+            if not future.done():
+                future.set_result(result)
+
 
 class MatchingCrew:
     """
@@ -27,23 +280,92 @@ class MatchingCrew:
     3. MatchingAgent - Finds merchant candidates
     4. AvailabilityAgent - Checks time slots
     5. RankingAgent - Ranks options by fit
+
+    The agents are module-level singletons and are used directly.
     """
 
-    def __init__(self):
+    __slots__ = ("dispatcher",)
+
+    def __init__(self, activate_batching: bool = False):
         """Initialize the matching crew with all agents"""
-        self.conversation_agent = conversation_agent
-        self.qa_agent = quality_assurance_agent
-        self.matching_agent = matching_agent
-        self.availability_agent = availability_agent
-        self.ranking_agent = ranking_agent
+        # Optional request coalescing for the matching and availability stages
+        self.dispatcher: Optional[_BatchingDispatcher] = None
+        if activate_batching:
+            self.dispatcher = _BatchingDispatcher({
+                "matching": matching_agent.execute,
+                "availability": availability_agent.execute
+            })
 
         logger.info("MatchingCrew initialized with 5 agents")
 
+    async def _find_candidates(
+        self,
+        preferences: Dict[str, Any],
+        user_location: Optional[Dict[str, float]],
+        max_distance: float
+    ) -> Dict[str, Any]:
+        """Run MatchingAgent (cached), through the dispatcher when batching is active"""
+        async def fetch() -> Dict[str, Any]:
+            if self.dispatcher is None:
+                return await matching_agent.execute(
+                    preferences=preferences,
+                    user_location=user_location,
+                    max_distance=max_distance
+                )
+
+            # Requests for the same service/location/budget share filter output
+            key = (
+                _preferences_key(preferences),
+                tuple(sorted(user_location.items())) if user_location else None,
+                max_distance
+            )
+            return await self.dispatcher.submit(
+                "matching",
+                key,
+                preferences=preferences,
+                user_location=user_location,
+                max_distance=max_distance
+            )
+
+        return await _cached_lookup(
+            _candidate_cache_key(preferences, user_location, max_distance),
+            fetch,
+            cacheable=lambda result: result.get("status") == "success"
+        )
+
+    async def _check_availability(
+        self,
+        candidates: List[Dict[str, Any]],
+        preferences: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run AvailabilityAgent, through the dispatcher when batching is active"""
+        kwargs = {
+            "candidates": candidates,
+            "preferred_date": preferences.get("preferred_date"),
+            "preferred_time": preferences.get("preferred_time"),
+            "time_constraint": preferences.get("time_constraint"),
+            "time_urgency": preferences.get("time_urgency", "flexible")
+        }
+
+        if self.dispatcher is None:
+            return await availability_agent.execute(**kwargs)
+
+        # Same candidate set and same date/time window -> same slots
+        key = (
+            tuple(c.get("provider_id") or c.get("id") for c in candidates),
+            kwargs["preferred_date"],
+            kwargs["preferred_time"],
+            kwargs["time_constraint"],
+            kwargs["time_urgency"]
+        )
+        return await self.dispatcher.submit("availability", key, **kwargs)
+
     async def run_preference_gathering(
         self,
         user_message: str,
         conversation_history: List[Dict[str, str]],
-        current_preferences: Dict[str, Any]
+        current_preferences: Dict[str, Any],
+        on_ready_to_match: Optional[Callable[[Dict[str, Any]], Any]] = None
     ) -> Dict[str, Any]:
         """
         Phase 1: Gather and validate user preferences
@@ -52,6 +374,8 @@ class MatchingCrew:
             user_message: Current message from user
             conversation_history: Previous conversation messages
             current_preferences: Already extracted preferences
+            on_ready_to_match: Optional hook called with the extracted
+                preferences just before QA validation starts
 
         Returns:
             dict: {
@@ -63,10 +387,35 @@ class MatchingCrew:
             }
         """
         try:
+            # Fast path: the client handed back complete preferences and the user
+            # just confirmed, so validate directly without another LLM round-trip
+            if (
+                current_preferences
+                and user_message.strip().lower().rstrip("!.") in _CONTINUE_MESSAGES
+                and readiness_detector_tool.execute({
+                    "current_preferences": current_preferences
+                }).get("ready_to_match")
+            ):
+                qa_result = await quality_assurance_agent.execute(preferences=current_preferences)
+
+                if qa_result.get("ready_to_proceed", qa_result.get("validation_passed", False)):
+                    logger.info("Preferences already complete. Skipping ConversationAgent.")
+
+                    if on_ready_to_match is not None:
+                        on_ready_to_match(current_preferences)
+
+                    return {
+                        "ready_to_match": True,
+                        "extracted_preferences": current_preferences,
+                        "response_to_user": "Great, let me find the best matches for you!",
+                        "next_question": None,
+                        "conversation_context": ""
+                    }
+
             # Step 1: Run ConversationAgent to extract preferences
-            logger.info(f"Running ConversationAgent with message: {user_message[:50]}...")
+            logger.info("Running ConversationAgent with message: %.50s...", user_message)
 
-            conversation_result = await self.conversation_agent.execute(
+            conversation_result = await conversation_agent.execute(
                 user_message=user_message,
                 conversation_history=conversation_history,
                 current_preferences=current_preferences
@@ -82,7 +431,10 @@ class MatchingCrew:
             if ready_to_match:
                 logger.info("ConversationAgent says ready to match. Running QA validation...")
 
-                qa_result = await self.qa_agent.execute(
+                if on_ready_to_match is not None:
+                    on_ready_to_match(extracted_preferences)
+
+                qa_result = await quality_assurance_agent.execute(
                     preferences=extracted_preferences
                 )
 
@@ -99,7 +451,7 @@ class MatchingCrew:
 
                 if not is_valid:
                     # QA found issues - need more information
-                    logger.warning(f"QA validation failed with issues: {issues}")
+                    logger.warning("QA validation failed with issues: %s", issues)
 
                     ready_to_match = False
                     response_to_user = clarification_message or "I need a bit more information."
@@ -119,7 +471,7 @@ class MatchingCrew:
             }
 
         except Exception as e:
-            logger.error(f"Error in preference gathering: {e}", exc_info=True)
+            logger.error("Error in preference gathering: %s", e, exc_info=True)
 
             # Fallback response
             return {
@@ -229,24 +581,53 @@ class MatchingCrew:
                 "search_summary": str
             }
         """
+        ranked_options = []
+        summary: Dict[str, Any] = {}
+
+        async for item in self.run_matching_and_ranking_stream(
+            preferences=preferences,
+            user_location=user_location,
+            max_distance=max_distance
+        ):
+            if "summary" in item:
+                summary = item["summary"]
+            else:
+                ranked_options.append(item)
+
+        return {"ranked_options": ranked_options, **summary}
+
+    async def run_matching_and_ranking_stream(
+        self,
+        preferences: Dict[str, Any],
+        user_location: Optional[Dict[str, float]] = None,
+        max_distance: float = 10.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of run_matching_and_ranking
+
+        Yields each ranked option (same shape as ranked_options entries) as soon
+        as it is formatted, then a final {"summary": {...}} item carrying
+        total_options_found, search_summary and, on fallback paths,
+        suggestions/alternative_matches.
+        """
         try:
             # Step 1: Run MatchingAgent to find candidates
-            logger.info(f"Running MatchingAgent with preferences: {preferences.get('service_type')}")
+            logger.info("Running MatchingAgent with preferences: %s", preferences.get("service_type"))
 
-            matching_result = await self.matching_agent.execute(
+            matching_result = await self._find_candidates(
                 preferences=preferences,
                 user_location=user_location,
                 max_distance=max_distance
             )
 
             if matching_result.get("status") != "success":
-                logger.warning(f"MatchingAgent returned non-success: {matching_result.get('message')}")
+                logger.warning("MatchingAgent returned non-success: %s", matching_result.get("message"))
 
-                return {
-                    "ranked_options": [],
+                yield {"summary": {
                     "total_options_found": 0,
                     "search_summary": matching_result.get("message", "No providers found matching your criteria.")
-                }
+                }}
+                return
 
             candidates = matching_result.get("candidates", [])
             candidate_count = matching_result.get("candidate_count", 0)
@@ -255,31 +636,20 @@ class MatchingCrew:
                 # Generate intelligent fallback suggestions
                 fallback_suggestions = await self._generate_fallback_suggestions(preferences, user_location, max_distance)
 
-                return {
-                    "ranked_options": [],
+                yield {"summary": {
                     "total_options_found": 0,
                     "search_summary": fallback_suggestions["message"],
                     "suggestions": fallback_suggestions.get("suggestions", []),
                     "alternative_matches": fallback_suggestions.get("alternative_matches", [])
-                }
+                }}
+                return
 
-            logger.info(f"MatchingAgent found {candidate_count} candidates")
+            logger.info("MatchingAgent found %d candidates", candidate_count)
 
             # Step 2: Run AvailabilityAgent to check time slots
             logger.info("Running AvailabilityAgent to check availability...")
 
-            time_urgency = preferences.get("time_urgency", "flexible")
-            preferred_date = preferences.get("preferred_date")
-            preferred_time = preferences.get("preferred_time")
-            time_constraint = preferences.get("time_constraint")
-
-            availability_result = await self.availability_agent.execute(
-                candidates=candidates,
-                preferred_date=preferred_date,
-                preferred_time=preferred_time,
-                time_constraint=time_constraint,
-                time_urgency=time_urgency
-            )
+            availability_result = await self._check_availability(candidates, preferences)
 
             available_providers = availability_result.get("candidates_with_slots", [])
             available_count = availability_result.get("providers_available", 0)
@@ -292,23 +662,24 @@ class MatchingCrew:
                     candidates, preferences, user_location
                 )
 
-                return {
-                    "ranked_options": [],
+                yield {"summary": {
                     "total_options_found": candidate_count,
                     "search_summary": fallback_suggestions["message"],
                     "suggestions": fallback_suggestions.get("suggestions", []),
                     "alternative_matches": fallback_suggestions.get("alternative_matches", [])
-                }
+                }}
+                return
 
-            logger.info(f"AvailabilityAgent found {available_count} available providers")
+            logger.info("AvailabilityAgent found %d available providers", available_count)
 
             # Step 3: Run RankingAgent to rank by fit
             logger.info("Running RankingAgent to rank providers...")
 
-            ranking_result = await self.ranking_agent.execute(
+            ranking_result = await ranking_agent.execute(
                 candidates=available_providers,
                 user_preferences=preferences,
-                user_location=user_location
+                user_location=user_location,
+                top_k=_TOP_K
             )
 
             ranked_providers = ranking_result.get("ranked_providers", [])
@@ -316,78 +687,44 @@ class MatchingCrew:
             if not ranked_providers:
                 logger.warning("RankingAgent returned no ranked providers")
 
-                return {
-                    "ranked_options": [],
+                yield {"summary": {
                     "total_options_found": available_count,
                     "search_summary": f"Found {available_count} available providers but couldn't rank them."
-                }
+                }}
+                return
 
-            logger.info(f"RankingAgent ranked {len(ranked_providers)} providers")
-
-            # Format output
-            ranked_options = []
-
-            for rank, provider in enumerate(ranked_providers[:10], start=1):
-                # Format available times as time strings
-                available_slots = provider.get("available_slots", [])
-                formatted_times = []
-                for slot in available_slots[:5]:  # First 5 slots
-                    if isinstance(slot, dict):
-                        time_str = slot.get("time", slot.get("datetime", ""))
-                        formatted_times.append(time_str)
-                    else:
-                        formatted_times.append(str(slot))
-
-                ranked_options.append({
-                    "rank": rank,
-                    "merchant_id": provider.get("provider_id"),
-                    "merchant_name": provider.get("provider_name"),
-                    "service_name": provider.get("service_name"),
-                    "service_type": preferences.get("service_type"),
-                    "distance": round(provider.get("distance_miles", 0), 1) if provider.get("distance_miles") else None,
-                    "price": float(provider.get("price", 0)),
-                    "rating": float(provider.get("rating", 0)),
-                    "reviews": int(provider.get("review_count", 0)),
-                    "available_times": formatted_times,
-                    "why_recommended": provider.get("recommendation_reason", "Great match for your needs"),
-                    "relevance_score": round(provider.get("overall_score", 0) / 100, 2),  # Convert to 0-1 scale
-
-                    # Enhanced fields for real provider data
-                    "photo_url": provider.get("photo_url", ""),
-                    "photos": provider.get("photos", []),
-                    "address": provider.get("address", ""),
-                    "city": provider.get("city", ""),
-                    "state": provider.get("state", ""),
-                    "phone": provider.get("phone", ""),
-                    "price_range": provider.get("price_range", ""),
-                    "specialties": provider.get("specialties", []),
-                    "stylist_names": provider.get("stylist_names", []),
-                    "booking_url": provider.get("booking_url", ""),
-                    "bio": provider.get("bio", ""),
-                    "yelp_url": provider.get("yelp_url", "")
-                })
+            logger.info("RankingAgent ranked %d providers", len(ranked_providers))
+
+            # Format and yield each option as soon as it is ready
+            service_type = preferences.get("service_type")
+            top_providers = ranked_providers[:_TOP_K]
+            top_choice = None
+
+            for rank, provider in enumerate(top_providers, start=1):
+                option = _format_ranked_option(rank, provider, service_type)
+                if top_choice is None:
+                    top_choice = option
+                yield option
 
             search_summary = (
-                f"Found {len(ranked_options)} excellent matches! "
-                f"Top choice: {ranked_options[0]['merchant_name']} "
-                f"(${ranked_options[0]['price']}, {ranked_options[0]['rating']}⭐)"
+                f"Found {len(top_providers)} excellent matches! "
+                f"Top choice: {top_choice['merchant_name']} "
+                f"(${top_choice['price']}, {top_choice['rating']}⭐)"
             )
 
-            return {
-                "ranked_options": ranked_options,
-                "total_options_found": len(ranked_options),
+            yield {"summary": {
+                "total_options_found": len(top_providers),
                 "search_summary": search_summary
-            }
+            }}
 
         except Exception as e:
-            logger.error(f"Error in matching and ranking: {e}", exc_info=True)
+            logger.error("Error in matching and ranking: %s", e, exc_info=True)
 
             # Fallback response
-            return {
-                "ranked_options": [],
+            yield {"summary": {
                 "total_options_found": 0,
                 "search_summary": f"An error occurred during matching: {str(e)}"
-            }
+            }}
 
     async def run_complete_flow(
         self,
@@ -412,32 +749,52 @@ class MatchingCrew:
         Returns:
             dict: Combined result from both phases
         """
+        speculative_match: Optional[asyncio.Task] = None
+
         try:
-            # Phase 1: Gather preferences
-            gathering_result = await self.run_preference_gathering(
-                user_message=user_message,
-                conversation_history=conversation_history,
-                current_preferences=current_preferences
-            )
+            # The task group owns the speculative match: it is cancelled if
+            # phase 1 rejects the preferences or anything in the flow raises
+            async with asyncio.TaskGroup() as tg:
+
+                def start_speculative_match(preferences: Dict[str, Any]) -> None:
+                    # Start matching while QA validates; discarded if QA rejects
+                    nonlocal speculative_match
+                    speculative_match = tg.create_task(
+                        self.run_matching_and_ranking(
+                            preferences=preferences,
+                            user_location=user_location,
+                            max_distance=max_distance
+                        )
+                    )
+
+                # Phase 1: Gather preferences
+                gathering_result = await self.run_preference_gathering(
+                    user_message=user_message,
+                    conversation_history=conversation_history,
+                    current_preferences=current_preferences,
+                    on_ready_to_match=start_speculative_match
+                )
 
-            # If not ready to match, return just the gathering result
-            if not gathering_result.get("ready_to_match"):
-                return {
-                    "phase": "preference_gathering",
-                    "ready_to_match": False,
-                    "response_to_user": gathering_result.get("response_to_user"),
-                    "next_question": gathering_result.get("next_question"),
-                    "extracted_preferences": gathering_result.get("extracted_preferences")
-                }
+                # If not ready to match, return just the gathering result
+                if not gathering_result.get("ready_to_match"):
+                    if speculative_match is not None:
+                        speculative_match.cancel()
+
+                    return {
+                        "phase": "preference_gathering",
+                        "ready_to_match": False,
+                        "response_to_user": gathering_result.get("response_to_user"),
+                        "next_question": gathering_result.get("next_question"),
+                        "extracted_preferences": gathering_result.get("extracted_preferences")
+                    }
 
-            # Phase 2: Match and rank
-            logger.info("Preferences complete. Running matching and ranking...")
+                # Phase 2: Match and rank (already running if QA passed in phase 1)
+                logger.info("Preferences complete. Running matching and ranking...")
 
-            matching_result = await self.run_matching_and_ranking(
-                preferences=gathering_result.get("extracted_preferences"),
-                user_location=user_location,
-                max_distance=max_distance
-            )
+                if speculative_match is None:
+                    start_speculative_match(gathering_result.get("extracted_preferences"))
+
+            matching_result = speculative_match.result()
 
             return {
                 "phase": "matching_complete",
@@ -449,7 +806,7 @@ class MatchingCrew:
             }
 
         except Exception as e:
-            logger.error(f"Error in complete flow: {e}", exc_info=True)
+            logger.error("Error in complete flow: %s", e, exc_info=True)
 
             return {
                 "phase": "error",
@@ -487,72 +844,90 @@ class MatchingCrew:
             suggestions = []
             alternative_matches = []
 
-            # Try relaxing budget constraint
-            if preferences.get("budget_max"):
-                relaxed_budget_prefs = preferences.copy()
-                budget_increase = preferences["budget_max"] * 0.3  # 30% increase
-                relaxed_budget_prefs["budget_max"] = preferences["budget_max"] + budget_increase
+            service_type = preferences.get("service_type")
+            budget_min = preferences.get("budget_min")
+            budget_max = preferences.get("budget_max")
+
+            relax_budget = bool(budget_max)
+            relax_time = bool(preferences.get("preferred_date") or preferences.get("time_urgency"))
+
+            # Both relaxations start from the same service lookup
+            service_results = {}
+            if relax_budget or relax_time:
+                service_results = await _cached_lookup(
+                    ("service_filter", (service_type or "").strip().lower()),
+                    lambda: asyncio.to_thread(
+                        service_filter_tool.execute,
+                        {"service_type": service_type}
+                    ),
+                    cacheable=lambda result: result.get("count", 0) > 0
+                )
+            matching_services = service_results.get("matching_services", [])
+            have_services = service_results.get("count", 0) > 0
+
+            async def try_relaxed_budget():
+                # Try relaxing budget constraint
+                if not relax_budget:
+                    return None
 
-                # Quick check without full matching flow
-                from services.tools.matching_tools import service_filter_tool, budget_filter_tool
+                budget_increase = budget_max * 0.3  # 30% increase
 
-                service_results = service_filter_tool.execute({
-                    "service_type": preferences.get("service_type")
+                budget_results = await asyncio.to_thread(budget_filter_tool.execute, {
+                    "budget_max": budget_max + budget_increase,
+                    "budget_min": budget_min,
+                    "services": list(matching_services)  # the tool may sort in place
                 })
 
-                if service_results.get("count", 0) > 0:
-                    budget_results = budget_filter_tool.execute({
-                        "budget_max": relaxed_budget_prefs["budget_max"],
-                        "budget_min": relaxed_budget_prefs.get("budget_min"),
-                        "services": service_results.get("matching_services", [])
-                    })
-
-                    if budget_results.get("count", 0) > 0:
-                        cheapest = min(
-                            budget_results["affordable_services"],
-                            key=lambda x: x.get("base_price", float('inf'))
-                        )
-                        suggestions.append(
-                            f"If you raise your budget to ${cheapest['base_price']:.0f}, "
-                            f"{cheapest['merchant_name']} would be available"
-                        )
-                        alternative_matches.append({
-                            "provider_name": cheapest["merchant_name"],
-                            "price": cheapest["base_price"],
-                            "adjustment_needed": "budget",
-                            "new_budget": cheapest["base_price"]
-                        })
-
-            # Try relaxing time constraint
-            if preferences.get("preferred_date") or preferences.get("time_urgency"):
-                # Suggest flexible timing
-                relaxed_time_prefs = preferences.copy()
-                relaxed_time_prefs["time_urgency"] = "flexible"
-                relaxed_time_prefs.pop("preferred_date", None)
-                relaxed_time_prefs.pop("preferred_time", None)
-                relaxed_time_prefs.pop("time_constraint", None)
-
-                # Quick availability check
-                from services.tools.matching_tools import service_filter_tool
-                service_results = service_filter_tool.execute({
-                    "service_type": preferences.get("service_type")
+                if budget_results.get("count", 0) == 0:
+                    return None
+
+                # BudgetFilterTool returns services sorted cheapest first
+                cheapest = budget_results["affordable_services"][0]
+                suggestion = (
+                    f"If you raise your budget to ${cheapest['base_price']:.0f}, "
+                    f"{cheapest['merchant_name']} would be available"
+                )
+                alternative = {
+                    "provider_name": cheapest["merchant_name"],
+                    "price": cheapest["base_price"],
+                    "adjustment_needed": "budget",
+                    "new_budget": cheapest["base_price"]
+                }
+                return suggestion, alternative
+
+            async def try_relaxed_time():
+                # Try relaxing time constraint: check if budget filter passes with flexible timing
+                if not relax_time:
+                    return None
+
+                budget_results = await asyncio.to_thread(budget_filter_tool.execute, {
+                    "budget_max": budget_max,
+                    "budget_min": budget_min,
+                    "services": list(matching_services)  # the tool may sort in place
                 })
 
-                if service_results.get("count", 0) > 0:
-                    # Check if budget filter passes with flexible timing
-                    from services.tools.matching_tools import budget_filter_tool
-                    budget_results = budget_filter_tool.execute({
-                        "budget_max": preferences.get("budget_max"),
-                        "budget_min": preferences.get("budget_min"),
-                        "services": service_results.get("matching_services", [])
-                    })
-
-                    if budget_results.get("count", 0) > 0:
-                        preferred_date_str = preferences.get("preferred_date", "your preferred time")
-                        suggestions.append(
-                            f"If you're flexible with timing (not strict about {preferred_date_str}), "
-                            f"{budget_results['count']} provider(s) would be available"
-                        )
+                if budget_results.get("count", 0) == 0:
+                    return None
+
+                preferred_date_str = preferences.get("preferred_date", "your preferred time")
+                return (
+                    f"If you're flexible with timing (not strict about {preferred_date_str}), "
+                    f"{budget_results['count']} provider(s) would be available"
+                )
+
+            # No services of this type at all: neither relaxation can help
+            budget_suggestion = time_suggestion = None
+            if have_services:
+                budget_suggestion, time_suggestion = await asyncio.gather(
+                    try_relaxed_budget(), try_relaxed_time()
+                )
+
+            if budget_suggestion:
+                suggestions.append(budget_suggestion[0])
+                alternative_matches.append(budget_suggestion[1])
+
+            if time_suggestion:
+                suggestions.append(time_suggestion)
 
             # Try expanding location radius
             if user_location and max_distance < 25:
@@ -587,7 +962,7 @@ class MatchingCrew:
             }
 
         except Exception as e:
-            logger.error(f"Error generating fallback suggestions: {e}", exc_info=True)
+            logger.error("Error generating fallback suggestions: %s", e, exc_info=True)
             return {
                 "message": "No providers found. Try adjusting your budget, timing, or location.",
                 "suggestions": [],
@@ -626,17 +1001,16 @@ class MatchingCrew:
 
             # Suggest alternative timing
             if preferred_date:
-                from datetime import datetime, timedelta
-                target_date = datetime.fromisoformat(preferred_date)
+                target_date = _parse_preferred_date(preferred_date)
 
                 # Suggest day before
-                day_before = (target_date - timedelta(days=1)).date().isoformat()
+                day_before = (target_date - timedelta(days=1)).isoformat()
                 suggestions.append(
                     f"Try the day before ({day_before}) for better availability"
                 )
 
                 # Suggest day after
-                day_after = (target_date + timedelta(days=1)).date().isoformat()
+                day_after = (target_date + timedelta(days=1)).isoformat()
                 suggestions.append(
                     f"Try the day after ({day_after}) for more options"
                 )
@@ -649,9 +1023,8 @@ class MatchingCrew:
 
             if preferred_time:
                 # Suggest different time of day
-                from datetime import datetime
-                time_obj = datetime.strptime(preferred_time, "%H:%M")
-                hour = time_obj.hour
+                # Only the hour is needed; preferred_time is "HH:MM"
+                hour = int(preferred_time.split(":", 1)[0])
 
                 if hour < 12:
                     suggestions.append("Try afternoon or evening slots (after 12pm)")
@@ -691,7 +1064,7 @@ class MatchingCrew:
             }
 
         except Exception as e:
-            logger.error(f"Error generating availability fallback: {e}", exc_info=True)
+            logger.error("Error generating availability fallback: %s", e, exc_info=True)
             return {
                 "message": "No availability found. Try flexible timing or different dates.",
                 "suggestions": [],
@@ -3,13 +3,20 @@ Google Calendar Tool for GlowGo
 Allows checking user's calendar for availability with smart time suggestions
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+import re
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from datetime import date, datetime, time as dt_time, timedelta
 import pytz
+from sqlalchemy import bindparam, select
 from crewai.tools import BaseTool
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from functools import lru_cache
 import json
 
 from models.database import SessionLocal
@@ -17,6 +24,41 @@ from models.user import User
 
 logger = logging.getLogger(__name__)
 
+# Calendar timezone (assuming EST for now, in production should store user's timezone)
+EASTERN_TZ_NAME = "America/New_York"
+EASTERN_TZ = pytz.timezone(EASTERN_TZ_NAME)
+
+# Whole-day window checked by GoogleCalendarTool when no time is given (9am-9pm)
+_DAY_START = dt_time(9, 0)
+_DAY_END = dt_time(21, 0)
+
+# Business hours used for slot suggestions (9am - 7pm)
+BUSINESS_START_HOUR = 9
+BUSINESS_END_HOUR = 19
+_BUSINESS_START = dt_time(BUSINESS_START_HOUR, 0)
+_BUSINESS_SPAN = timedelta(hours=BUSINESS_END_HOUR - BUSINESS_START_HOUR)
+
+# Buffer kept free before and after every calendar event
+BUFFER_MINUTES = 30
+BUFFER_TD = timedelta(minutes=BUFFER_MINUTES)
+
+# Preferred start hours before big events, 10am - 2pm (gives time to get ready after)
+PREF_START, PREF_END = 10, 15
+
+# Google Calendar accepts at most 50 calls per batch request
+_CALENDAR_BATCH_LIMIT = 50
+
+# Display formats for dates and times shown to the user
+_DATE_FMT = "%A, %B %d"
+_TIME_FMT = "%I:%M %p"
+
+# Event fields read by analyze_calendar_for_smart_suggestions (partial response)
+# Location is only shown for a single target date; the 7-day scan needs just names and intervals
+_EVENT_FIELDS = "items(summary,location,start(date,dateTime),end(date,dateTime))"
+_EVENT_FIELDS_NO_LOCATION = "items(summary,start(date,dateTime),end(date,dateTime))"
+# Cap on events returned for a single target date
+_DAY_EVENT_LIMIT = 50
+
 # Service duration estimates in minutes
 SERVICE_DURATIONS = {
     "haircut": 60,
@@ -49,6 +91,99 @@ IMPORTANT_EVENT_KEYWORDS = [
 ]
 
 
+def _keyword_pattern(keywords: List[str]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation (same result as any(kw in text ...))"""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+_IMPORTANT_EVENT_RE = _keyword_pattern(IMPORTANT_EVENT_KEYWORDS)
+
+# Importance categories in priority order; the earliest matching category decides the reason
+_IMPORTANCE_REASONS = [
+    (("wedding", "bridal", "engagement"),
+     "Special celebration where you'll want to look your absolute best"),
+    (("interview", "pitch", "client", "board"),
+     "Professional event where first impressions matter"),
+    (("date", "anniversary"),
+     "Romantic occasion where looking great is a must"),
+    (("photo", "video", "performance"),
+     "You'll be photographed or on camera"),
+    (("party", "gala", "dinner"),
+     "Social event with many people"),
+    (("meeting", "conference", "presentation"),
+     "Professional gathering where you'll meet important people"),
+]
+
+# keyword -> (category priority, reason)
+_KEYWORD_TO_REASON = {
+    kw: (priority, reason)
+    for priority, (keywords, reason) in enumerate(_IMPORTANCE_REASONS)
+    for kw in keywords
+}
+
+# Zero-width lookahead so overlapping keywords are all seen in one scan
+_IMPORTANCE_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(kw) for kw in _KEYWORD_TO_REASON) + "))"
+)
+
+
+# Per-user Google access tokens: user_id -> (fetched_at, token)
+_TOKEN_CACHE_TTL = 300
+_TOKEN_CACHE_MAX = 1024
+_TOKEN_CACHE: Dict[str, Tuple[float, str]] = {}
+
+# Column-only Core statements, built once and reused from SQLAlchemy's compiled cache
+_TOKEN_STMT = select(User.google_access_token).where(User.id == bindparam("uid"))
+_TOKENS_STMT = select(User.id, User.google_access_token).where(
+    User.id.in_(bindparam("uids", expanding=True)),
+    User.google_access_token.isnot(None)
+)
+
+
+def _get_access_token(user_id: str) -> Optional[str]:
+    """Return the user's Google access token, hitting the DB at most once per TTL"""
+    key = str(user_id)
+    entry = _TOKEN_CACHE.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _TOKEN_CACHE_TTL:
+        return entry[1]
+
+    with SessionLocal() as db:
+        token = db.execute(_TOKEN_STMT, {"uid": user_id}).scalar()
+
+    # Only cache connected users so a fresh Calendar connection shows up immediately
+    if token:
+        _remember_token(key, token, time.monotonic())
+    return token
+
+
+def _remember_token(key: str, token: str, fetched_at: float) -> None:
+    """Store a token, evicting the oldest entry once the cache is full"""
+    if key not in _TOKEN_CACHE and len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAX:
+        _TOKEN_CACHE.pop(next(iter(_TOKEN_CACHE)), None)
+    _TOKEN_CACHE[key] = (fetched_at, token)
+
+
+def invalidate_access_token(user_id: str) -> None:
+    """Drop a cached token (call after the user's Google token changes)"""
+    _TOKEN_CACHE.pop(str(user_id), None)
+
+
+@lru_cache(maxsize=1)
+def _calendar_discovery_doc() -> Optional[Dict[str, Any]]:
+    """Parsed Calendar v3 discovery document bundled with googleapiclient (loaded once)"""
+    doc = get_static_doc("calendar", "v3")
+    return json.loads(doc) if doc else None
+
+
+def _calendar_service(access_token: str):
+    """Build a Calendar API client for one user's token from the cached discovery document"""
+    creds = Credentials(token=access_token)
+    doc = _calendar_discovery_doc()
+    if doc is None:
+        return build('calendar', 'v3', credentials=creds, cache_discovery=False)
+    return build_from_document(doc, credentials=creds)
+
+
 class GoogleCalendarTool(BaseTool):
     """
     Tool for checking user's Google Calendar availability
@@ -67,7 +202,6 @@ class GoogleCalendarTool(BaseTool):
 
     def _run(self, input_data: Dict[str, Any]) -> str:
         """Check calendar availability"""
-        db = SessionLocal()
         try:
             # Parse input
             user_id = input_data.get("user_id")
@@ -77,14 +211,12 @@ class GoogleCalendarTool(BaseTool):
             if not user_id:
                 return "Error: User ID is required"
                 
-            # Get user and token
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user or not user.google_access_token:
+            # Get user's token
+            token = _get_access_token(user_id)
+            if not token:
                 return "Error: User has not connected their Google Calendar"
                 
-            # Create credentials
-            creds = Credentials(token=user.google_access_token)
-            service = build('calendar', 'v3', credentials=creds)
+            service = _calendar_service(token)
             
             # Calculate time range
             target_date = datetime.fromisoformat(date_str)
@@ -96,12 +228,11 @@ class GoogleCalendarTool(BaseTool):
                 start_dt = datetime.combine(target_date.date(), target_time) - timedelta(hours=2)
                 end_dt = datetime.combine(target_date.date(), target_time) + timedelta(hours=2)
             else:
-                start_dt = datetime.combine(target_date.date(), datetime.strptime("09:00", "%H:%M").time())
-                end_dt = datetime.combine(target_date.date(), datetime.strptime("21:00", "%H:%M").time())
+                start_dt = datetime.combine(target_date.date(), _DAY_START)
+                end_dt = datetime.combine(target_date.date(), _DAY_END)
             
             # Convert to UTC isoformat for API
-            # Assuming EST for now, in production should store user's timezone
-            tz = pytz.timezone('America/New_York')
+            tz = EASTERN_TZ
             start_iso = tz.localize(start_dt).isoformat()
             end_iso = tz.localize(end_dt).isoformat()
             
@@ -109,7 +240,7 @@ class GoogleCalendarTool(BaseTool):
             body = {
                 "timeMin": start_iso,
                 "timeMax": end_iso,
-                "timeZone": "America/New_York",
+                "timeZone": EASTERN_TZ_NAME,
                 "items": [{"id": "primary"}]
             }
             
@@ -119,13 +250,13 @@ class GoogleCalendarTool(BaseTool):
             busy_slots = primary.get('busy', [])
             
             if not busy_slots:
-                return f"Great news! Your calendar is completely free on {date_str} between {start_dt.strftime('%I:%M %p')} and {end_dt.strftime('%I:%M %p')}."
+                return f"Great news! Your calendar is completely free on {date_str} between {start_dt.strftime(_TIME_FMT)} and {end_dt.strftime(_TIME_FMT)}."
                 
             # Format busy slots for the agent
             busy_text = []
             for slot in busy_slots:
-                start = datetime.fromisoformat(slot['start']).strftime('%I:%M %p')
-                end = datetime.fromisoformat(slot['end']).strftime('%I:%M %p')
+                start = datetime.fromisoformat(slot['start']).strftime(_TIME_FMT)
+                end = datetime.fromisoformat(slot['end']).strftime(_TIME_FMT)
                 busy_text.append(f"{start} - {end}")
                 
             return f"You have the following events on your calendar:\n" + "\n".join(busy_text)
@@ -133,12 +264,86 @@ class GoogleCalendarTool(BaseTool):
         except Exception as e:
             logger.error(f"Calendar check error: {e}")
             return f"Error checking calendar: {str(e)}"
-        finally:
-            db.close()
 
 google_calendar_tool = GoogleCalendarTool()
 
 
+def get_busy_periods_bulk(
+    user_ids: List[str],
+    time_min: datetime,
+    time_max: datetime
+) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Fetch free/busy intervals for several users with batched Calendar API calls.
+
+    Each user's query carries their own credentials, but up to 50 queries share
+    a single HTTP round trip instead of one request per user.
+
+    Args:
+        user_ids: Users to look up (users without a connected calendar are skipped)
+        time_min: Timezone-aware window start
+        time_max: Timezone-aware window end
+
+    Returns:
+        Dict mapping user_id to its list of {"start", "end"} busy intervals
+    """
+    # Batch request ids must be unique, so each user is queried once
+    user_ids = list(dict.fromkeys(map(str, user_ids)))
+    if not user_ids:
+        return {}
+
+    # Serve cached tokens and fetch only the rest in one query
+    now = time.monotonic()
+    tokens: Dict[str, str] = {}
+    missing = []
+    for user_id in user_ids:
+        entry = _TOKEN_CACHE.get(user_id)
+        if entry is not None and now - entry[0] < _TOKEN_CACHE_TTL:
+            tokens[user_id] = entry[1]
+        else:
+            missing.append(user_id)
+
+    if missing:
+        with SessionLocal() as db:
+            fetched = db.execute(_TOKENS_STMT, {"uids": missing}).all()
+        for user_id, token in fetched:
+            _remember_token(str(user_id), token, now)
+            tokens[str(user_id)] = token
+    rows = list(tokens.items())
+
+    busy_by_user: Dict[str, List[Dict[str, str]]] = {}
+
+    def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        if exception is not None:
+            logger.warning("Free/busy lookup failed for user %s: %s", request_id, exception)
+            return
+        busy_by_user[request_id] = response.get('calendars', {}).get('primary', {}).get('busy', [])
+
+    body = {
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "timeZone": EASTERN_TZ_NAME,
+        "items": [{"id": "primary"}]
+    }
+
+    for offset in range(0, len(rows), _CALENDAR_BATCH_LIMIT):
+        chunk = rows[offset:offset + _CALENDAR_BATCH_LIMIT]
+        batch = None
+
+        for user_id, token in chunk:
+            service = _calendar_service(token)
+            if batch is None:
+                batch = service.new_batch_http_request(callback=on_response)
+            batch.add(service.freebusy().query(body=body), request_id=user_id)
+
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error("Batched free/busy request failed: %s", e)
+
+    return busy_by_user
+
+
 async def analyze_calendar_for_smart_suggestions(
     user_id: str,
     service_type: str,
@@ -163,7 +368,6 @@ async def analyze_calendar_for_smart_suggestions(
     Returns:
         Dict with suggested_slots, important_events, and reasoning
     """
-    db = SessionLocal()
     result = {
         "has_calendar": False,
         "suggested_slots": [],
@@ -175,25 +379,12 @@ async def analyze_calendar_for_smart_suggestions(
     }
 
     try:
-        # Get user and token
-        user = db.query(User).filter(User.id == user_id).first()
-        if not user or not user.google_access_token:
-            result["reasoning"] = "User has not connected their Google Calendar"
-            return result
-
-        result["has_calendar"] = True
-
-        # Create credentials
-        creds = Credentials(token=user.google_access_token)
-        service = build('calendar', 'v3', credentials=creds)
-
         # Get service duration
         service_duration = SERVICE_DURATIONS.get(service_type.lower(), SERVICE_DURATIONS["default"])
-        buffer_time = 30  # 30 minutes before and after
-        total_time_needed = service_duration + (buffer_time * 2)  # service + buffer before + after
+        total_time_needed = service_duration + (BUFFER_MINUTES * 2)  # service + buffer before + after
 
         # Timezone
-        tz = pytz.timezone('America/New_York')
+        tz = EASTERN_TZ
         now = datetime.now(tz)
 
         # Determine date range
@@ -206,23 +397,27 @@ async def analyze_calendar_for_smart_suggestions(
             start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
             end_date = start_date + timedelta(days=7)
 
-        # Fetch actual events (not just free/busy) to get event names
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_date.isoformat(),
-            timeMax=end_date.isoformat(),
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        # DB lookup and Calendar API call are blocking; keep them off the event loop
+        events = await asyncio.to_thread(
+            _fetch_calendar_events,
+            user_id,
+            start_date,
+            end_date,
+            _EVENT_FIELDS if target_date else _EVENT_FIELDS_NO_LOCATION,
+            _DAY_EVENT_LIMIT if target_date else None
+        )
+        if events is None:
+            result["reasoning"] = "User has not connected their Google Calendar"
+            return result
 
-        events = events_result.get('items', [])
+        result["has_calendar"] = True
 
         # Process events - ONLY include future events
         processed_events = []
         important_events = []
 
-        print(f"[CalendarAnalysis] Current time: {now.strftime('%Y-%m-%d %H:%M %Z')}")
-        print(f"[CalendarAnalysis] Found {len(events)} total events, filtering for future events...")
+        logger.debug("[CalendarAnalysis] Current time: %s", now)
+        logger.debug("[CalendarAnalysis] Found %d total events, filtering for future events...", len(events))
 
         for event in events:
             event_start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
@@ -234,79 +429,77 @@ async def analyze_calendar_for_smart_suggestions(
 
             # Parse datetime
             try:
-                if 'T' in event_start:
-                    start_dt = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                    # Ensure timezone awareness
-                    if start_dt.tzinfo is None:
-                        start_dt = tz.localize(start_dt)
-                else:
-                    # All-day event
-                    start_dt = tz.localize(datetime.fromisoformat(event_start))
-
-                if 'T' in event_end:
-                    end_dt = datetime.fromisoformat(event_end.replace('Z', '+00:00'))
-                    if end_dt.tzinfo is None:
-                        end_dt = tz.localize(end_dt)
-                else:
-                    end_dt = tz.localize(datetime.fromisoformat(event_end))
+                start_dt = _parse_event_time(event_start, tz)
+                end_dt = _parse_event_time(event_end, tz)
             except Exception as e:
-                print(f"[CalendarAnalysis] Error parsing event '{event_name}': {e}")
+                logger.warning("[CalendarAnalysis] Error parsing event '%s': %s", event_name, e)
                 continue
 
             # SKIP events that have already ended
             if end_dt < now:
-                print(f"[CalendarAnalysis] Skipping past event: {event_name} (ended {end_dt.strftime('%Y-%m-%d %H:%M')})")
+                logger.debug("[CalendarAnalysis] Skipping past event: %s (ended %s)", event_name, end_dt)
                 continue
 
-            print(f"[CalendarAnalysis] Future event: {event_name} at {start_dt.strftime('%Y-%m-%d %H:%M')}")
+            logger.debug("[CalendarAnalysis] Future event: %s at %s", event_name, start_dt)
 
-            processed_events.append({
+            processed_event = {
                 "name": event_name,
                 "start": start_dt,
                 "end": end_dt,
+                # Buffered busy interval, computed once for every gap search
+                "busy_start": start_dt - BUFFER_TD,
+                "busy_end": end_dt + BUFFER_TD,
                 "location": event.get('location', '')
-            })
+            }
+            processed_events.append(processed_event)
 
             # Check if this is an important event (only for future events)
             event_name_lower = event_name.lower()
-            is_important = any(kw in event_name_lower for kw in IMPORTANT_EVENT_KEYWORDS)
+            is_important = _IMPORTANT_EVENT_RE.search(event_name_lower) is not None
 
             if is_important:
+                # Formatted once here and reused by events_on_date below
+                processed_event["time_fmt"] = start_dt.strftime(_TIME_FMT)
                 important_events.append({
                     "name": event_name,
-                    "date": start_dt.strftime("%A, %B %d"),
-                    "time": start_dt.strftime("%I:%M %p"),
+                    "date": start_dt.strftime(_DATE_FMT),
+                    "time": processed_event["time_fmt"],
                     "start_dt": start_dt,  # Keep datetime for comparison
                     "why_important": _get_importance_reason(event_name_lower)
                 })
-                print(f"[CalendarAnalysis] Important event detected: {event_name} on {start_dt.strftime('%A, %B %d')}")
+                logger.debug("[CalendarAnalysis] Important event detected: %s on %s", event_name, start_dt)
 
         result["important_events"] = important_events
 
+        # Bucket events by start date once (each bucket stays in start order)
+        events_by_date: Dict[date, List[Dict[str, Any]]] = defaultdict(list)
+        for e in processed_events:
+            events_by_date[e["start"].date()].append(e)
+
         # If we have a target date, find events on that date
         if target_date:
             result["events_on_date"] = [
                 {
                     "name": e["name"],
-                    "start_time": e["start"].strftime("%I:%M %p"),
-                    "end_time": e["end"].strftime("%I:%M %p"),
+                    "start_time": e.get("time_fmt") or e["start"].strftime(_TIME_FMT),
+                    "end_time": e["end"].strftime(_TIME_FMT),
                     "location": e.get("location", "")
                 }
-                for e in processed_events
+                for e in events_by_date.get(datetime.fromisoformat(target_date).date(), [])
             ]
 
         # Find available slots
         available_slots = _find_available_slots(
-            processed_events,
+            events_by_date,
             target_date,
             total_time_needed,
-            buffer_time,
             tz
         )
 
         result["suggested_slots"] = available_slots
 
         # Generate day-before suggestions for important events (only future ones)
+        slot_by_day: Dict[date, str] = {}
         for important_event in important_events:
             # Use the actual datetime we stored, not the formatted string
             event_start = important_event.get("start_dt")
@@ -315,33 +508,37 @@ async def analyze_calendar_for_smart_suggestions(
 
             # Only suggest day-before if event is at least 1 day away
             if event_start - now < timedelta(hours=24):
-                print(f"[CalendarAnalysis] Skipping day-before suggestion for {important_event['name']} - event is less than 24 hours away")
+                logger.debug(
+                    "[CalendarAnalysis] Skipping day-before suggestion for %s - event is less than 24 hours away",
+                    important_event["name"]
+                )
                 continue
 
             day_before = event_start - timedelta(days=1)
-
-            # Find events on the day before to suggest a good time slot
-            day_before_events = [e for e in processed_events if e["start"].date() == day_before.date()]
-            day_before_events.sort(key=lambda x: x["start"])
-
-            # Find the best available slot on the day before
-            suggested_time = _find_best_slot_for_day(
-                day_before,
-                day_before_events,
-                total_time_needed,
-                buffer_time,
-                tz,
-                now
-            )
+            day_before_date = day_before.date()
+
+            # Find the best available slot on the day before (once per day)
+            suggested_time = slot_by_day.get(day_before_date)
+            if suggested_time is None:
+                suggested_time = slot_by_day[day_before_date] = _find_best_slot_for_day(
+                    day_before,
+                    events_by_date.get(day_before_date, []),
+                    total_time_needed,
+                    tz,
+                    now
+                )
 
             result["day_before_suggestions"].append({
                 "event_name": important_event["name"],
                 "event_date": important_event["date"],
-                "suggested_day": day_before.strftime("%A, %B %d"),
+                "suggested_day": day_before.strftime(_DATE_FMT),
                 "suggested_time": suggested_time,
                 "reason": f"Get your {service_type} done before {important_event['name']} so you look your best!"
             })
-            print(f"[CalendarAnalysis] Day-before suggestion: {service_type} on {day_before.strftime('%A, %B %d')} at {suggested_time} before {important_event['name']}")
+            logger.debug(
+                "[CalendarAnalysis] Day-before suggestion: %s on %s at %s before %s",
+                service_type, day_before.date(), suggested_time, important_event["name"]
+            )
 
         # Build smart suggestion text
         result["smart_suggestion"] = _build_smart_suggestion(
@@ -357,15 +554,89 @@ async def analyze_calendar_for_smart_suggestions(
         logger.error(f"Calendar analysis error: {e}", exc_info=True)
         result["reasoning"] = f"Error analyzing calendar: {str(e)}"
         return result
-    finally:
-        db.close()
+
+
+def _fetch_calendar_events(
+    user_id: str,
+    time_min: datetime,
+    time_max: datetime,
+    fields: str = _EVENT_FIELDS,
+    max_results: Optional[int] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetch the user's primary-calendar events in [time_min, time_max) (blocking).
+
+    fields selects a partial response; max_results caps the number of events returned.
+
+    Returns None if the user has not connected Google Calendar.
+    """
+    token = _get_access_token(user_id)
+    if not token:
+        return None
+
+    service = _calendar_service(token)
+
+    # Fetch actual events (not just free/busy) to get event names.
+    # Partial response: only the fields used by the analysis (no attendees, attachments, etc.)
+    params = {
+        "calendarId": 'primary',
+        "timeMin": time_min.isoformat(),
+        "timeMax": time_max.isoformat(),
+        "singleEvents": True,
+        "orderBy": 'startTime',
+        "fields": fields
+    }
+    if max_results:
+        params["maxResults"] = max_results
+    events_result = service.events().list(**params).execute()
+
+    return events_result.get('items', [])
+
+
+def _parse_event_time(value: str, tz) -> datetime:
+    """Parse a Calendar API start/end value (RFC 3339 dateTime or all-day date)"""
+    if 'T' in value:
+        # dateTime always carries an offset or 'Z', both handled natively by fromisoformat
+        return datetime.fromisoformat(value)
+    # All-day event
+    return tz.localize(datetime.fromisoformat(value))
+
+
+def _iter_gaps(
+    events: List[Dict[str, Any]],
+    day_start: datetime,
+    day_end: datetime,
+    min_minutes: int
+) -> Iterator[Tuple[datetime, datetime, Any, Any]]:
+    """
+    Yield free gaps of at least min_minutes between day_start and day_end.
+
+    events are processed events sorted by start, each carrying its buffered
+    busy_start/busy_end; overlapping periods are merged in the same pass. Each gap
+    is yielded as (gap_start, gap_end, event_before, event_after), with None at the day edges.
+    """
+    cursor = day_start
+    before = None
+
+    for event in events:
+        busy_start = event["busy_start"]
+        if busy_start >= day_end:
+            break
+        if busy_start > cursor and (busy_start - cursor).total_seconds() / 60 >= min_minutes:
+            yield cursor, busy_start, before, event
+        busy_end = event["busy_end"]
+        if busy_end > cursor:
+            cursor = busy_end
+            before = event
+
+    if cursor < day_end and (day_end - cursor).total_seconds() / 60 >= min_minutes:
+        yield cursor, day_end, before, None
 
 
 def _find_best_slot_for_day(
     target_day: datetime,
     events_on_day: List[Dict],
     total_time_needed: int,
-    buffer_time: int,
     tz,
     now: datetime
 ) -> str:
@@ -379,15 +650,9 @@ def _find_best_slot_for_day(
 
     Returns a formatted time string like "11:00 AM" or "2:30 PM"
     """
-    # Business hours
-    day_start_hour = 9
-    day_end_hour = 19
-
-    # Preferred hours for beauty services before big events (gives time to get ready after)
-    preferred_hours = [10, 11, 12, 13, 14]  # 10am - 2pm
-
-    day_start = tz.localize(target_day.replace(hour=day_start_hour, minute=0, second=0, microsecond=0, tzinfo=None))
-    day_end = tz.localize(target_day.replace(hour=day_end_hour, minute=0, second=0, microsecond=0, tzinfo=None))
+    # One localize per day; DST switches at 2am, so business hours are a fixed span
+    day_start = tz.localize(datetime.combine(target_day.date(), _BUSINESS_START))
+    day_end = day_start + _BUSINESS_SPAN
 
     # If the day is today, start from now + 1 hour minimum
     if target_day.date() == now.date():
@@ -399,180 +664,99 @@ def _find_best_slot_for_day(
         # No events - pick preferred time (11 AM is ideal)
         return "11:00 AM"
 
-    # Build list of busy periods (with buffer)
-    busy_periods = []
-    for event in events_on_day:
-        event_start = event["start"] - timedelta(minutes=buffer_time)
-        event_end = event["end"] + timedelta(minutes=buffer_time)
-        busy_periods.append((event_start, event_end))
-
-    # Sort by start time
-    busy_periods.sort(key=lambda x: x[0])
-
-    # Find available slots
-    available_slots = []
-
-    # Check before first event
-    if busy_periods[0][0] > day_start:
-        gap_minutes = (busy_periods[0][0] - day_start).total_seconds() / 60
-        if gap_minutes >= total_time_needed:
-            available_slots.append({
-                "start": day_start,
-                "end": busy_periods[0][0],
-                "minutes": gap_minutes
-            })
-
-    # Check between events
-    for i in range(len(busy_periods) - 1):
-        gap_start = busy_periods[i][1]
-        gap_end = busy_periods[i + 1][0]
-        gap_minutes = (gap_end - gap_start).total_seconds() / 60
-
-        if gap_minutes >= total_time_needed:
-            available_slots.append({
-                "start": gap_start,
-                "end": gap_end,
-                "minutes": gap_minutes
-            })
-
-    # Check after last event
-    if busy_periods[-1][1] < day_end:
-        gap_minutes = (day_end - busy_periods[-1][1]).total_seconds() / 60
-        if gap_minutes >= total_time_needed:
-            available_slots.append({
-                "start": busy_periods[-1][1],
-                "end": day_end,
-                "minutes": gap_minutes
-            })
+    # Events arrive sorted by start (API orderBy=startTime) with buffered busy bounds
+    available_slots = [
+        (gap_start, gap_end)
+        for gap_start, gap_end, _, _ in _iter_gaps(events_on_day, day_start, day_end, total_time_needed)
+    ]
 
     if not available_slots:
         # No slots available - return None or a fallback
-        print(f"[CalendarAnalysis] No available slots found on {target_day.strftime('%A, %B %d')}")
+        logger.debug("[CalendarAnalysis] No available slots found on %s", target_day.date())
         return "No available time"
 
-    # Find slot that contains preferred hours
-    for slot in available_slots:
-        slot_start_hour = slot["start"].hour
-        slot_end_hour = slot["end"].hour
-
-        for preferred_hour in preferred_hours:
-            if slot_start_hour <= preferred_hour < slot_end_hour:
-                # This slot contains a preferred hour
-                suggested_dt = slot["start"].replace(hour=preferred_hour, minute=0)
-                # Make sure it's actually within the slot
-                if suggested_dt >= slot["start"] and suggested_dt < slot["end"]:
-                    return suggested_dt.strftime("%I:%M %p").lstrip("0")
+    # Earliest whole preferred hour inside a slot
+    for slot_start, slot_end in available_slots:
+        hour = max(slot_start.hour + (1 if slot_start.minute else 0), PREF_START)
+        if hour < min(slot_end.hour, PREF_END):
+            return slot_start.replace(hour=hour, minute=0).strftime(_TIME_FMT).lstrip("0")
 
     # No preferred hours available - use the start of the first available slot
-    first_slot = available_slots[0]
+    first_start = available_slots[0][0]
     # Round up to nearest 30 minutes
-    suggested_minute = 0 if first_slot["start"].minute < 30 else 30
-    if first_slot["start"].minute > 30:
-        suggested_dt = first_slot["start"].replace(minute=0) + timedelta(hours=1)
+    suggested_minute = 0 if first_start.minute < 30 else 30
+    if first_start.minute > 30:
+        suggested_dt = first_start.replace(minute=0) + timedelta(hours=1)
     else:
-        suggested_dt = first_slot["start"].replace(minute=suggested_minute)
+        suggested_dt = first_start.replace(minute=suggested_minute)
 
-    return suggested_dt.strftime("%I:%M %p").lstrip("0")
+    return suggested_dt.strftime(_TIME_FMT).lstrip("0")
 
 
 def _get_importance_reason(event_name_lower: str) -> str:
     """Determine why an event is important based on keywords"""
-    if any(kw in event_name_lower for kw in ["wedding", "bridal", "engagement"]):
-        return "Special celebration where you'll want to look your absolute best"
-    elif any(kw in event_name_lower for kw in ["interview", "pitch", "client", "board"]):
-        return "Professional event where first impressions matter"
-    elif any(kw in event_name_lower for kw in ["date", "anniversary"]):
-        return "Romantic occasion where looking great is a must"
-    elif any(kw in event_name_lower for kw in ["photo", "video", "performance"]):
-        return "You'll be photographed or on camera"
-    elif any(kw in event_name_lower for kw in ["party", "gala", "dinner"]):
-        return "Social event with many people"
-    elif any(kw in event_name_lower for kw in ["meeting", "conference", "presentation"]):
-        return "Professional gathering where you'll meet important people"
-    else:
-        return "Important event where looking polished matters"
+    best = None
+    for match in _IMPORTANCE_KEYWORD_RE.finditer(event_name_lower):
+        entry = _KEYWORD_TO_REASON[match.group(1)]
+        if best is None or entry[0] < best[0]:
+            best = entry
+            if best[0] == 0:
+                break
+    return best[1] if best else "Important event where looking polished matters"
 
 
 def _find_available_slots(
-    events: List[Dict],
+    events_by_date: Dict[date, List[Dict]],
     target_date: Optional[str],
     total_time_needed: int,
-    buffer_time: int,
     tz
 ) -> List[Dict[str, Any]]:
     """Find available time slots between events"""
     slots = []
     now = datetime.now(tz)
 
-    # Define business hours (9am - 7pm)
-    business_start = 9
-    business_end = 19
-
     # If target_date specified, only look at that day
     if target_date:
         target = datetime.fromisoformat(target_date)
         target = tz.localize(target.replace(hour=0, minute=0, second=0))
 
-        # Filter events for target date
-        day_events = [e for e in events if e["start"].date() == target.date()]
-
-        # Sort by start time
-        day_events.sort(key=lambda x: x["start"])
+        # Events for target date (already in start order from the API)
+        day_events = events_by_date.get(target.date(), [])
 
         # Check slot before first event
-        day_start = target.replace(hour=business_start, minute=0)
-        if now.date() == target.date() and now.hour >= business_start:
+        day_start = target.replace(hour=BUSINESS_START_HOUR, minute=0)
+        if now.date() == target.date() and now.hour >= BUSINESS_START_HOUR:
             day_start = now + timedelta(minutes=30)  # At least 30 min from now
+        day_end = target.replace(hour=BUSINESS_END_HOUR, minute=0)
+        target_label = target.strftime(_DATE_FMT)
 
         if day_events:
-            first_event_start = day_events[0]["start"] - timedelta(minutes=buffer_time)
-            gap = (first_event_start - day_start).total_seconds() / 60
-
-            if gap >= total_time_needed:
-                slots.append({
-                    "start_time": day_start.strftime("%I:%M %p"),
-                    "end_time": first_event_start.strftime("%I:%M %p"),
-                    "date": target.strftime("%A, %B %d"),
-                    "type": "before_first_event",
-                    "note": f"Before your {day_events[0]['name']}"
-                })
-
-            # Check gaps between events
-            for i in range(len(day_events) - 1):
-                current_end = day_events[i]["end"] + timedelta(minutes=buffer_time)
-                next_start = day_events[i + 1]["start"] - timedelta(minutes=buffer_time)
-
-                gap = (next_start - current_end).total_seconds() / 60
-
-                if gap >= total_time_needed:
-                    slots.append({
-                        "start_time": current_end.strftime("%I:%M %p"),
-                        "end_time": next_start.strftime("%I:%M %p"),
-                        "date": target.strftime("%A, %B %d"),
-                        "type": "between_events",
-                        "note": f"Between {day_events[i]['name']} and {day_events[i + 1]['name']}"
-                    })
-
-            # Check slot after last event
-            last_event_end = day_events[-1]["end"] + timedelta(minutes=buffer_time)
-            day_end = target.replace(hour=business_end, minute=0)
-
-            gap = (day_end - last_event_end).total_seconds() / 60
+            for gap_start, gap_end, before, after in _iter_gaps(
+                day_events, day_start, day_end, total_time_needed
+            ):
+                if before is None:
+                    slot_type = "before_first_event"
+                    note = f"Before your {(after or day_events[0])['name']}"
+                elif after is None:
+                    slot_type = "after_last_event"
+                    note = f"After your {before['name']}"
+                else:
+                    slot_type = "between_events"
+                    note = f"Between {before['name']} and {after['name']}"
 
-            if gap >= total_time_needed:
                 slots.append({
-                    "start_time": last_event_end.strftime("%I:%M %p"),
-                    "end_time": day_end.strftime("%I:%M %p"),
-                    "date": target.strftime("%A, %B %d"),
-                    "type": "after_last_event",
-                    "note": f"After your {day_events[-1]['name']}"
+                    "start_time": gap_start.strftime(_TIME_FMT),
+                    "end_time": gap_end.strftime(_TIME_FMT),
+                    "date": target_label,
+                    "type": slot_type,
+                    "note": note
                 })
         else:
             # No events - whole day available
             slots.append({
-                "start_time": day_start.strftime("%I:%M %p"),
-                "end_time": target.replace(hour=business_end, minute=0).strftime("%I:%M %p"),
-                "date": target.strftime("%A, %B %d"),
+                "start_time": day_start.strftime(_TIME_FMT),
+                "end_time": day_end.strftime(_TIME_FMT),
+                "date": target_label,
                 "type": "free_day",
                 "note": "Your calendar is free this day!"
             })
@@ -629,7 +813,6 @@ Example: [{{"name": "Wedding", "importance_score": 10, "reason": "Special celebr
         result_text = response.content.strip()
 
         # Parse JSON response
-        import json
         # Handle potential markdown code blocks
         if "```json" in result_text:
             result_text = result_text.split("```json")[1].split("```")[0].strip()
@@ -4,7 +4,8 @@ Production-ready tools with Pydantic validation
 """
 
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
@@ -154,6 +155,80 @@ ordinal_word_to_num = {
     'twenty-ninth': '29', 'thirtieth': '30', 'thirty-first': '31'
 }
 
+# Patterns used by PreferenceExtractorTool, compiled once at import.
+# The substitution tables keep the order the words were applied in, since
+# each substitution sees the output of the previous ones.
+
+# Word numbers -> digits for budgets, longest words first so "forty five" is
+# matched before "five"
+_BUDGET_WORD_SUBS = [
+    (re.compile(r"\b" + word + r"\b", re.IGNORECASE), num)
+    for word, num in sorted(numbers_dicts.items(), key=lambda x: len(x[0]), reverse=True)
+]
+_UP_TO_RE = re.compile(
+    r"(?:up to|under|less than|below|not more than|max(?:imum)?)\s*\$?\s*(\d+(?:\.\d{2})?)"
+)
+_DOLLAR_RE = re.compile(r"\$\s*(\d+(?:\.\d{2})?)")
+_TRAILING_DOLLAR_RE = re.compile(r"(\d+(?:\.\d{2})?)\s*\$")
+_BUDGET_CONTEXT_RE = re.compile(r"(\d+(?:\.\d{2})?)\s*(?:dollars?|bucks?|budget)")
+_RANGE_RE = re.compile(r"(\d+(?:\.\d{2})?)\s*(?:-|to)\s*(\d+(?:\.\d{2})?)")
+
+_SPECIFIC_TIME_RE = re.compile(r'\d{1,2}\s*(am|pm|:\d{2})')
+
+# "the third" -> "3"
+_ORDINAL_SUBS = [
+    (re.compile(r'\b(?:the\s+)?' + ordinal_word + r'\b', re.IGNORECASE), ordinal_num)
+    for ordinal_word, ordinal_num in ordinal_word_to_num.items()
+]
+
+
+def _words_alternation(words) -> str:
+    """Regex alternation of words, longest first (so "forty five" beats "forty")"""
+    return "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# Spoken times are matched with one alternation each and converted via the
+# word -> number dicts above, instead of one substitution per word pair.
+# Compound hours ("forty-nine", "twenty five") are left out: their last word
+# is matched on its own, as the per-word substitutions always did.
+_SPOKEN_HOUR_WORDS = _words_alternation(
+    word for word in time_word_to_num if '-' not in word and ' ' not in word
+)
+# "five thirty pm" -> "5:30 pm"
+_SPOKEN_HOUR_MINUTE_RE = re.compile(
+    r'\b(' + _SPOKEN_HOUR_WORDS + r')\s+(' + _words_alternation(minute_words) + r')\b(?=\s*(am|pm))',
+    re.IGNORECASE
+)
+# "three pm" / "three o'clock" -> "3 pm" / "3 o'clock"
+_SPOKEN_HOUR_RE = re.compile(
+    r'\b(' + _SPOKEN_HOUR_WORDS + r')\b(?=\s*(am|pm|o\'clock|oclock))',
+    re.IGNORECASE
+)
+_OCLOCK_RE = re.compile(r'(\d{1,2})\s*(?:o\'clock|oclock)', re.IGNORECASE)
+
+_TIME_PATTERNS = [
+    re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)'),  # 3:30pm, 3:30 pm
+    re.compile(r'(\d{1,2})\s*(am|pm)'),           # 3pm, 3 pm
+    re.compile(r'(\d{1,2}):(\d{2})')              # 15:00, 3:30 (24h format)
+]
+
+_MONTHS = {
+    "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
+    "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
+    "august": 8, "aug": 8, "september": 9, "sep": 9, "october": 10, "oct": 10,
+    "november": 11, "nov": 11, "december": 12, "dec": 12
+}
+# "December 3", "December 3rd", "Dec 03"
+_MONTH_DAY_PATTERNS = [
+    (month_name, month_num, re.compile(rf'{month_name}\s+(\d{{1,2}})(?:st|nd|rd|th)?'))
+    for month_name, month_num in _MONTHS.items()
+]
+
+# Word boundaries avoid false positives (e.g., "anywhere" contains "any")
+_OPENNESS_RE = re.compile(
+    r"\bopen\b|\banyone\b|\bno preference\b|\bany provider\b|\bany stylist\b|\bany barber\b"
+)
+
 
 class IntentParserTool(BaseModel):
     """Tool to parse user intent and identify service type"""
@@ -266,111 +341,124 @@ class PreferenceExtractorTool(BaseModel):
 
         Returns:
             {"budget_min": float, "budget_max": float, "time_urgency": str, "artisan_preference": str,
-             "preferred_date": str, "preferred_time": str, "time_constraint": str, "location": str}
+             "preferred_date": str, "preferred_date_obj": date, "preferred_time": str,
+             "time_constraint": str, "location": str}
         """
         try:
             message = inputs.get("message", "")
             current_prefs = inputs.get("current_preferences", {})
 
-            # Debug logging
-            print(f"\n[PreferenceExtractor] Processing message: '{message}'")
-
-            result = {
-                "budget_min": current_prefs.get("budget_min"),
-                "budget_max": current_prefs.get("budget_max"),
-                "time_urgency": current_prefs.get("time_urgency"),
-                "artisan_preference": current_prefs.get("artisan_preference"),
-                "special_notes": current_prefs.get("special_notes"),
-                "preferred_date": current_prefs.get("preferred_date"),
-                "preferred_time": current_prefs.get("preferred_time"),
-                "time_constraint": current_prefs.get("time_constraint"),
-                "location": current_prefs.get("location")
-            }
-
-            # Extract budget
-            budget = self._extract_budget(message)
-            # Use explicit None checks so that a valid 0 value is preserved
-            if budget["budget_min"] is not None:
-                result["budget_min"] = budget["budget_min"]
-            if budget["budget_max"] is not None:
-                result["budget_max"] = budget["budget_max"]
-
-            # Extract urgency (returns urgency category)
-            urgency = self._extract_urgency(message)
-            if urgency:
-                result["time_urgency"] = urgency
-
-            # Extract specific date and time details
-            datetime_details = self._extract_datetime_details(message)
-            if datetime_details["preferred_date"]:
-                result["preferred_date"] = datetime_details["preferred_date"]
-            if datetime_details["preferred_time"]:
-                result["preferred_time"] = datetime_details["preferred_time"]
-            if datetime_details["time_constraint"]:
-                result["time_constraint"] = datetime_details["time_constraint"]
-
-            # Extract artisan preference
-            artisan_pref = self._extract_artisan_preference(message)
-            if artisan_pref:
-                result["artisan_preference"] = artisan_pref
-
-            # Extract location (Boston/Cambridge area)
-            location = self._extract_location(message)
-            if location:
-                result["location"] = location
-
-            # Debug logging - show what was extracted
-            extracted_items = {k: v for k, v in result.items() if v is not None}
-            print(f"[PreferenceExtractor] Extracted: {extracted_items}")
-
-            return result
+            try:
+                prefs_key = tuple(sorted(current_prefs.items()))
+                hash(prefs_key)
+            except TypeError:
+                # Unhashable preference values - extract without the memo
+                return self._extract_preferences(message, current_prefs)
+
+            # Relative dates ("tomorrow", "end of week" after 5pm) depend on
+            # the current hour, so it is part of the key
+            clock = datetime.now().strftime("%Y-%m-%d %H")
+            # Copy so callers can't mutate the cached result
+            return dict(_extract_preferences_cached(message, prefs_key, clock))
 
         except Exception as e:
             print(f"PreferenceExtractorTool error: {e}")
             return inputs.get("current_preferences", {})
+
+    def _extract_preferences(self, message: str, current_prefs: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract preferences from message, starting from current_prefs (uncached)"""
+        # Debug logging
+        print(f"\n[PreferenceExtractor] Processing message: '{message}'")
+
+        result = {
+            "budget_min": current_prefs.get("budget_min"),
+            "budget_max": current_prefs.get("budget_max"),
+            "time_urgency": current_prefs.get("time_urgency"),
+            "artisan_preference": current_prefs.get("artisan_preference"),
+            "special_notes": current_prefs.get("special_notes"),
+            "preferred_date": current_prefs.get("preferred_date"),
+            "preferred_date_obj": None,
+            "preferred_time": current_prefs.get("preferred_time"),
+            "time_constraint": current_prefs.get("time_constraint"),
+            "location": current_prefs.get("location")
+        }
+
+        # Extract budget
+        budget = self._extract_budget(message)
+        # Use explicit None checks so that a valid 0 value is preserved
+        if budget["budget_min"] is not None:
+            result["budget_min"] = budget["budget_min"]
+        if budget["budget_max"] is not None:
+            result["budget_max"] = budget["budget_max"]
+
+        # Extract urgency (returns urgency category)
+        urgency = self._extract_urgency(message)
+        if urgency:
+            result["time_urgency"] = urgency
+
+        # Extract specific date and time details
+        datetime_details = self._extract_datetime_details(message)
+        if datetime_details["preferred_date"]:
+            result["preferred_date"] = datetime_details["preferred_date"]
+            result["preferred_date_obj"] = datetime_details["preferred_date_obj"]
+        elif result["preferred_date"]:
+            # Carried over from current_prefs - parse it once here for consumers
+            try:
+                result["preferred_date_obj"] = date.fromisoformat(result["preferred_date"])
+            except (TypeError, ValueError):
+                pass
+        if datetime_details["preferred_time"]:
+            result["preferred_time"] = datetime_details["preferred_time"]
+        if datetime_details["time_constraint"]:
+            result["time_constraint"] = datetime_details["time_constraint"]
+
+        # Extract artisan preference
+        artisan_pref = self._extract_artisan_preference(message)
+        if artisan_pref:
+            result["artisan_preference"] = artisan_pref
+
+        # Extract location (Boston/Cambridge area)
+        location = self._extract_location(message)
+        if location:
+            result["location"] = location
+
+        # Debug logging - show what was extracted
+        extracted_items = {k: v for k, v in result.items() if v is not None}
+        print(f"[PreferenceExtractor] Extracted: {extracted_items}")
+
+        return result
     
     def _extract_budget(self, text: str) -> Dict[str, Optional[float]]:
         """Extract budget from text"""
         # Only extract numbers with $ sign or budget-related context
         # This prevents extracting time numbers like "3 pm"
 
-        # Convert word numbers to digits in the text
-        # IMPORTANT: Sort by length (longest first) so "forty five" is matched before "five"
+        # Convert word numbers to digits in the text (longest words first)
         text_converted = text
-        sorted_words = sorted(numbers_dicts.items(), key=lambda x: len(x[0]), reverse=True)
-        for word, num in sorted_words:
-            # Match whole words only with word boundaries
-            pattern = r"\b" + word + r"\b"
-            text_converted = re.sub(pattern, num, text_converted, flags=re.IGNORECASE)
+        for pattern, num in _BUDGET_WORD_SUBS:
+            text_converted = pattern.sub(num, text_converted)
 
         text_lower = text_converted.lower()
 
         # Handle "up to / under / max" style phrases FIRST so they don't get short-circuited
         # Examples: "up to 100", "up to 100$", "under 50 dollars", "max 80"
-        up_to_pattern = re.search(
-            r"(?:up to|under|less than|below|not more than|max(?:imum)?)\s*\$?\s*(\d+(?:\.\d{2})?)",
-            text_lower,
-        )
+        up_to_pattern = _UP_TO_RE.search(text_lower)
         if up_to_pattern:
             amount = float(up_to_pattern.group(1))
             return {"budget_min": 0.0, "budget_max": amount}
 
         # Pattern 1: Explicit dollar amounts ($50, $ 50, 50$)
-        dollar_amounts = re.findall(r"\$\s*(\d+(?:\.\d{2})?)", text_converted)
-        trailing_dollar_amounts = re.findall(r"(\d+(?:\.\d{2})?)\s*\$", text_converted)
+        dollar_amounts = _DOLLAR_RE.findall(text_converted)
+        trailing_dollar_amounts = _TRAILING_DOLLAR_RE.findall(text_converted)
         dollar_amounts.extend(trailing_dollar_amounts)
 
         # Pattern 2: Numbers followed by budget keywords
-        budget_context = re.findall(
-            r"(\d+(?:\.\d{2})?)\s*(?:dollars?|bucks?|budget)", text_lower
-        )
+        budget_context = _BUDGET_CONTEXT_RE.findall(text_lower)
 
         # Pattern 3: Range pattern (50 - 80, 50-80, 50 to 80)
         # This is a strong signal of budget even without $ or keywords
         # BUT: Exclude if it looks like a time range (has am/pm nearby or values < 24)
-        range_match = re.search(
-            r"(\d+(?:\.\d{2})?)\s*(?:-|to)\s*(\d+(?:\.\d{2})?)", text_lower
-        )
+        range_match = _RANGE_RE.search(text_lower)
         if range_match:
             min_val = float(range_match.group(1))
             max_val = float(range_match.group(2))
@@ -453,7 +541,7 @@ class PreferenceExtractorTool(BaseModel):
         now = datetime.now()
 
         # Check if user provided specific time details (3pm, 5:30, etc.)
-        has_specific_time = bool(re.search(r'\d{1,2}\s*(am|pm|:\d{2})', text_lower))
+        has_specific_time = bool(_SPECIFIC_TIME_RE.search(text_lower))
 
         # Check if user mentioned constraint words (before, after, by)
         has_time_constraint = any(word in text_lower for word in ["before", "after", "by"])
@@ -502,7 +590,7 @@ class PreferenceExtractorTool(BaseModel):
 
         return None
 
-    def _extract_datetime_details(self, text: str) -> Dict[str, Optional[str]]:
+    def _extract_datetime_details(self, text: str) -> Dict[str, Any]:
         """
         Extract specific date, time, and time constraints from text
 
@@ -523,13 +611,15 @@ class PreferenceExtractorTool(BaseModel):
             "by end of week" → date: 2025-11-21 (Friday), constraint: by
 
         Returns:
-            {"preferred_date": str (ISO format), "preferred_time": str (24h format), "time_constraint": str}
+            {"preferred_date": str (ISO format), "preferred_date_obj": date (same day),
+             "preferred_time": str (24h format), "time_constraint": str}
         """
         text_lower = text.lower()
         now = datetime.now()
 
         result = {
             "preferred_date": None,
+            "preferred_date_obj": None,
             "preferred_time": None,
             "time_constraint": None
         }
@@ -550,14 +640,9 @@ class PreferenceExtractorTool(BaseModel):
         # Convert ordinal words to numbers for dates (e.g., "the third" -> "the 3")
         # This handles "December the third" -> "December the 3"
         text_with_ordinals = text_lower
-        for ordinal_word, ordinal_num in ordinal_word_to_num.items():
+        for pattern, ordinal_num in _ORDINAL_SUBS:
             # Match ordinal words (with optional "the" before)
-            text_with_ordinals = re.sub(
-                r'\b(?:the\s+)?' + ordinal_word + r'\b',
-                ordinal_num,
-                text_with_ordinals,
-                flags=re.IGNORECASE
-            )
+            text_with_ordinals = pattern.sub(ordinal_num, text_with_ordinals)
 
         print(f"[DateTimeExtractor] After ordinal conversion: '{text_with_ordinals}'")
 
@@ -565,48 +650,25 @@ class PreferenceExtractorTool(BaseModel):
         text_with_time_numbers = text_with_ordinals
 
         # Look for patterns like "five thirty pm" or "ten fifteen am"
-        for hour_word, hour_num in time_word_to_num.items():
-            for minute_word, minute_num in minute_words.items():
-                # Pattern: "five thirty pm"
-                pattern = r'\b' + hour_word + r'\s+' + minute_word + r'\b(?=\s*(am|pm))'
-                replacement = hour_num + ':' + minute_num
-                text_with_time_numbers = re.sub(
-                    pattern,
-                    replacement,
-                    text_with_time_numbers,
-                    flags=re.IGNORECASE
-                )
-
-        # Then handle simple hour expressions like "three pm"
-        for word, num in time_word_to_num.items():
-            # Match whole words followed by am/pm or o'clock
-            # Pattern: "three pm" or "three o'clock"
-            text_with_time_numbers = re.sub(
-                r'\b' + word + r'\b(?=\s*(am|pm|o\'clock|oclock))',
-                num,
-                text_with_time_numbers,
-                flags=re.IGNORECASE
-            )
+        text_with_time_numbers = _SPOKEN_HOUR_MINUTE_RE.sub(
+            lambda m: time_word_to_num[m.group(1).lower()] + ':' + minute_words[m.group(2).lower()],
+            text_with_time_numbers
+        )
 
-        # Handle "o'clock" format (e.g., "three o'clock" -> "3:00")
-        text_with_time_numbers = re.sub(
-            r'(\d{1,2})\s*(?:o\'clock|oclock)',
-            r'\1:00',
-            text_with_time_numbers,
-            flags=re.IGNORECASE
+        # Then handle simple hour expressions like "three pm" or "three o'clock"
+        text_with_time_numbers = _SPOKEN_HOUR_RE.sub(
+            lambda m: time_word_to_num[m.group(1).lower()],
+            text_with_time_numbers
         )
 
+        # Handle "o'clock" format (e.g., "three o'clock" -> "3:00")
+        text_with_time_numbers = _OCLOCK_RE.sub(r'\1:00', text_with_time_numbers)
+
         print(f"[DateTimeExtractor] After time word conversion: '{text_with_time_numbers}'")
 
         # Extract specific time (e.g., "3 pm", "3pm", "15:00", "3:30pm")
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm)',  # 3:30pm, 3:30 pm
-            r'(\d{1,2})\s*(am|pm)',           # 3pm, 3 pm
-            r'(\d{1,2}):(\d{2})'              # 15:00, 3:30 (24h format)
-        ]
-
-        for pattern in time_patterns:
-            match = re.search(pattern, text_with_time_numbers)
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(text_with_time_numbers)
             if match:
                 groups = match.groups()
 
@@ -654,13 +716,15 @@ class PreferenceExtractorTool(BaseModel):
 
         # Check for "today"
         if "today" in text_lower:
-            result["preferred_date"] = now.date().isoformat()
+            result["preferred_date_obj"] = now.date()
+            result["preferred_date"] = result["preferred_date_obj"].isoformat()
             print(f"[DateTimeExtractor] Found 'today': {result['preferred_date']}")
 
         # Check for "tomorrow"
         elif "tomorrow" in text_lower or "tmr" in text_lower:
             tomorrow = now + timedelta(days=1)
-            result["preferred_date"] = tomorrow.date().isoformat()
+            result["preferred_date_obj"] = tomorrow.date()
+            result["preferred_date"] = result["preferred_date_obj"].isoformat()
             print(f"[DateTimeExtractor] Found 'tomorrow': {result['preferred_date']}")
 
         # Check for "weekend" or "next weekend"
@@ -687,7 +751,8 @@ class PreferenceExtractorTool(BaseModel):
                     days_until_saturday = 6 if not is_next else 13  # 6 days to next Sat
 
             weekend_date = now + timedelta(days=days_until_saturday)
-            result["preferred_date"] = weekend_date.date().isoformat()
+            result["preferred_date_obj"] = weekend_date.date()
+            result["preferred_date"] = result["preferred_date_obj"].isoformat()
             print(f"[DateTimeExtractor] Found 'weekend': {result['preferred_date']} (Saturday)")
 
         # Check for "end of week" or "end of the week"
@@ -698,7 +763,8 @@ class PreferenceExtractorTool(BaseModel):
                 days_until_friday = 7  # Next Friday
 
             friday_date = now + timedelta(days=days_until_friday)
-            result["preferred_date"] = friday_date.date().isoformat()
+            result["preferred_date_obj"] = friday_date.date()
+            result["preferred_date"] = result["preferred_date_obj"].isoformat()
             print(f"[DateTimeExtractor] Found 'end of week': {result['preferred_date']} (Friday)")
 
         # Check for "next week" (without specific day)
@@ -712,24 +778,16 @@ class PreferenceExtractorTool(BaseModel):
                 days_until_next_monday = 7
 
             next_monday = now + timedelta(days=days_until_next_monday)
-            result["preferred_date"] = next_monday.date().isoformat()
+            result["preferred_date_obj"] = next_monday.date()
+            result["preferred_date"] = result["preferred_date_obj"].isoformat()
             print(f"[DateTimeExtractor] Found 'next week': {result['preferred_date']} (Monday)")
 
         # Check for explicit month+day patterns (e.g., "December 3rd", "Dec 3", "January 15th")
         # IMPORTANT: Use text_with_ordinals (where "third" → "3") not text_lower
         if not result["preferred_date"]:
-            months = {
-                "january": 1, "jan": 1, "february": 2, "feb": 2, "march": 3, "mar": 3,
-                "april": 4, "apr": 4, "may": 5, "june": 6, "jun": 6, "july": 7, "jul": 7,
-                "august": 8, "aug": 8, "september": 9, "sep": 9, "october": 10, "oct": 10,
-                "november": 11, "nov": 11, "december": 12, "dec": 12
-            }
-
-            for month_name, month_num in months.items():
+            for month_name, month_num, pattern in _MONTH_DAY_PATTERNS:
                 # Match patterns like "December 3", "December 3rd", "Dec 03", "december third"
-                # Ordinal patterns: 1st, 2nd, 3rd, 4th, 5th, etc.
-                pattern = rf'{month_name}\s+(\d{{1,2}})(?:st|nd|rd|th)?'
-                match = re.search(pattern, text_with_ordinals)
+                match = pattern.search(text_with_ordinals)
                 if match:
                     day = int(match.group(1))
                     year = now.year
@@ -739,7 +797,8 @@ class PreferenceExtractorTool(BaseModel):
                         target_date = datetime(year, month_num, day)
                         if target_date.date() < now.date():
                             target_date = datetime(year + 1, month_num, day)
-                        result["preferred_date"] = target_date.date().isoformat()
+                        result["preferred_date_obj"] = target_date.date()
+                        result["preferred_date"] = result["preferred_date_obj"].isoformat()
                         print(f"[DateTimeExtractor] Found explicit date '{month_name} {day}': {result['preferred_date']}")
                         break
                     except ValueError:
@@ -777,7 +836,8 @@ class PreferenceExtractorTool(BaseModel):
                             days_ahead = 7
 
                     target_date = now + timedelta(days=days_ahead)
-                    result["preferred_date"] = target_date.date().isoformat()
+                    result["preferred_date_obj"] = target_date.date()
+                    result["preferred_date"] = result["preferred_date_obj"].isoformat()
                     print(f"[DateTimeExtractor] Found {day_name} → date: {result['preferred_date']} (days_ahead: {days_ahead}, is_next_week: {is_next_week})")
                     break
 
@@ -800,11 +860,7 @@ class PreferenceExtractorTool(BaseModel):
             preferences.append("experienced")
 
         # Openness - use word boundaries to avoid false positives (e.g., "anywhere" contains "any")
-        openness_patterns = [
-            r"\bopen\b", r"\banyone\b", r"\bno preference\b",
-            r"\bany provider\b", r"\bany stylist\b", r"\bany barber\b"
-        ]
-        if any(re.search(pattern, text_lower) for pattern in openness_patterns):
+        if _OPENNESS_RE.search(text_lower):
             return "open to anyone"
 
         return " ".join(preferences) if preferences else None
@@ -1429,6 +1485,12 @@ class ReadinessDetectorTool(BaseModel):
             }
 
 
+@lru_cache(maxsize=1024)
+def _extract_preferences_cached(message: str, prefs_key: tuple, clock: str) -> Dict[str, Any]:
+    """Memoized preference extraction, keyed on message, current prefs and hour"""
+    return preference_extractor_tool._extract_preferences(message, dict(prefs_key))
+
+
 # Tool instances for easy import
 intent_parser_tool = IntentParserTool()
 preference_extractor_tool = PreferenceExtractorTool()
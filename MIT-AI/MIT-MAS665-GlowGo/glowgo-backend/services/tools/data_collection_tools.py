@@ -3,15 +3,22 @@ Data Collection Tools for GlowGo
 Tools for fetching real beauty service provider data from Yelp API and BrightData
 """
 
+import asyncio
+import atexit
+import hashlib
 import logging
+import time
 import httpx
-import json
+import orjson
 import re
-from typing import Dict, Any, List, Optional
+import zstandard
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Set, Tuple
 from datetime import datetime
+from functools import lru_cache
 from crewai.tools import BaseTool
 from pydantic import Field
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 from config import settings
 from models.database import SessionLocal
@@ -19,6 +26,310 @@ from models.database import SessionLocal
 logger = logging.getLogger(__name__)
 
 
+# Shared keep-alive pools so repeated calls skip the TCP/TLS handshake
+_POOL_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=60)
+_HTTP = httpx.Client(timeout=30.0, limits=_POOL_LIMITS)
+# BrightData scrapes take longer than Yelp lookups
+_SCRAPER_HTTP = httpx.Client(timeout=60.0, limits=_POOL_LIMITS)
+atexit.register(_HTTP.close)
+atexit.register(_SCRAPER_HTTP.close)
+
+YELP_SEARCH_URL = "https://api.yelp.com/v3/businesses/search"
+_YELP_MAX_CONCURRENT = 8
+
+# Async pool for concurrent Yelp fan-out; bound to the loop that created it.
+# HTTP/2 lets the detail lookups multiplex over one TLS connection (falls back
+# to HTTP/1.1 if the server doesn't negotiate h2).
+_AHTTP: Optional[httpx.AsyncClient] = None
+_AHTTP_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _async_http() -> httpx.AsyncClient:
+    """Shared AsyncClient for the running event loop (recreated if the loop changes)"""
+    global _AHTTP, _AHTTP_LOOP
+    loop = asyncio.get_running_loop()
+    if _AHTTP is None or _AHTTP_LOOP is not loop:
+        _AHTTP = httpx.AsyncClient(http2=True, timeout=30.0, limits=httpx.Limits(max_connections=50))
+        _AHTTP_LOOP = loop
+    return _AHTTP
+
+
+# Upstream failures worth retrying: rate limiting, server errors, network errors
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """True for errors a retry may fix (not 4xx client errors like 400/404)"""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, httpx.TransportError)
+
+
+# Up to 3 attempts with jittered exponential backoff (capped at 4s between tries)
+_retry_transient = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_random_exponential(multiplier=0.5, max=4),
+    retry=retry_if_exception(_is_transient),
+    reraise=True
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream that keeps failing"""
+
+
+class _CircuitBreaker:
+    """Fail fast after fail_max consecutive transient failures, for reset_timeout seconds"""
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def check(self) -> None:
+        """Raise CircuitOpenError while open; after reset_timeout let calls through again"""
+        if self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout:
+            raise CircuitOpenError(f"{self.name} is unavailable, try again shortly")
+
+    def record(self, exc: Optional[BaseException]) -> None:
+        """Record a call outcome (None on success)"""
+        if exc is None:
+            self._failures = 0
+            self._opened_at = None
+        elif _is_transient(exc):
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                # (Re)open; a failed trial call after the timeout reopens immediately
+                self._opened_at = time.monotonic()
+                logger.warning(f"{self.name} circuit open after {self._failures} consecutive failures")
+
+
+_YELP_BREAKER = _CircuitBreaker("Yelp API")
+_BRIGHTDATA_BREAKER = _CircuitBreaker("BrightData API")
+
+
+@_retry_transient
+def _get_with_retry(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]]) -> httpx.Response:
+    """GET on the shared pool, retrying transient failures"""
+    response = _HTTP.get(url, headers=headers, params=params)
+    response.raise_for_status()
+    return response
+
+
+@_retry_transient
+async def _aget_with_retry(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]]) -> httpx.Response:
+    """Async GET on the shared async pool, retrying transient failures"""
+    response = await _async_http().get(url, headers=headers, params=params)
+    response.raise_for_status()
+    return response
+
+
+@_retry_transient
+def _post_with_retry(url: str, headers: Dict[str, str], content: bytes) -> httpx.Response:
+    """POST on the scraper pool, retrying transient failures"""
+    response = _SCRAPER_HTTP.post(url, headers=headers, content=content)
+    response.raise_for_status()
+    return response
+
+
+def _yelp_get(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+    """GET from Yelp with retries, behind the Yelp circuit breaker"""
+    _YELP_BREAKER.check()
+    try:
+        response = _get_with_retry(url, headers, params)
+    except Exception as e:
+        _YELP_BREAKER.record(e)
+        raise
+    _YELP_BREAKER.record(None)
+    return response
+
+
+async def _ayelp_get(url: str, headers: Dict[str, str], params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+    """Async GET from Yelp with retries, behind the Yelp circuit breaker"""
+    _YELP_BREAKER.check()
+    try:
+        response = await _aget_with_retry(url, headers, params)
+    except Exception as e:
+        _YELP_BREAKER.record(e)
+        raise
+    _YELP_BREAKER.record(None)
+    return response
+
+
+def _brightdata_post(url: str, headers: Dict[str, str], content: bytes) -> httpx.Response:
+    """POST to BrightData with retries, behind the BrightData circuit breaker"""
+    _BRIGHTDATA_BREAKER.check()
+    try:
+        response = _post_with_retry(url, headers, content)
+    except Exception as e:
+        _BRIGHTDATA_BREAKER.record(e)
+        raise
+    _BRIGHTDATA_BREAKER.record(None)
+    return response
+
+
+# Yelp responses cached in-process for 24h (the longest Yelp's terms allow).
+# Entries younger than the fresh TTL are served as-is; older ones are still
+# served on the async path, but trigger a background refresh.
+# Values are (monotonic timestamp, zstd-compressed serialized tool result) -
+# the projected fields we use, never the raw Yelp payload.
+_YELP_CACHE_TTL = 86400  # seconds
+_YELP_FRESH_TTL = 3600  # seconds
+_YELP_CACHE_MAX = 512
+_YELP_CACHE_ZSTD_LEVEL = 3
+_YELP_CACHE: Dict[str, Tuple[float, bytes]] = {}
+# Async Yelp fetches in progress, so concurrent cache misses share one request
+_YELP_INFLIGHT: Dict[str, asyncio.Future] = {}
+# Background refresh tasks, referenced here so they aren't garbage collected
+_YELP_REFRESHING: Set[asyncio.Task] = set()
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string with orjson (tool results are str)"""
+    return orjson.dumps(obj).decode()
+
+
+def _yelp_cache_unpack(blob: bytes) -> str:
+    """Decompress a cached Yelp result back to the tool's JSON string"""
+    return zstandard.decompress(blob).decode()
+
+
+def _yelp_cache_get(key: str) -> Optional[str]:
+    """Return a cached Yelp result if not yet expired (stale entries included)"""
+    cached = _YELP_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < _YELP_CACHE_TTL:
+        return _yelp_cache_unpack(cached[1])
+    return None
+
+
+def _yelp_cache_set(key: str, value: str) -> None:
+    """Cache a Yelp result, evicting the oldest entry once full"""
+    if key not in _YELP_CACHE and len(_YELP_CACHE) >= _YELP_CACHE_MAX:
+        _YELP_CACHE.pop(next(iter(_YELP_CACHE)), None)
+    # Module-level zstandard functions: a shared (de)compressor object isn't
+    # safe across the to_thread workers running the sync tools
+    _YELP_CACHE[key] = (time.monotonic(), zstandard.compress(value.encode(), _YELP_CACHE_ZSTD_LEVEL))
+
+
+def _yelp_search_key(term: str, location: str, limit: int, categories: str) -> str:
+    """Cache key for a business search, built from the normalized query"""
+    params_hash = hashlib.sha1(orjson.dumps({
+        "term": term.lower().strip(),
+        "location": location.lower().strip(),
+        "limit": limit,
+        "categories": categories
+    }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return f"business_search:v1:{params_hash}"
+
+
+# Ask for compressed responses explicitly (some proxies drop the default);
+# httpx decodes both transparently (br via the brotli extra in requirements)
+_ACCEPT_ENCODING = "gzip, br"
+
+
+@lru_cache(maxsize=8)
+def _yelp_headers(api_key: str) -> Dict[str, str]:
+    """Yelp API request headers, built once per key (treat as read-only)"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Accept": "application/json",
+        "Accept-Encoding": _ACCEPT_ENCODING
+    }
+
+
+@lru_cache(maxsize=8)
+def _brightdata_headers(api_key: str) -> Dict[str, str]:
+    """BrightData API request headers, built once per key (treat as read-only)"""
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "Accept-Encoding": _ACCEPT_ENCODING
+    }
+
+
+def _yelp_details_key(business_id: str) -> str:
+    """Cache key for a business details lookup"""
+    return f"yelp_details:v1:{business_id}"
+
+
+async def _yelp_coalesced(key: str, fetch: Callable[[], Awaitable[str]]) -> str:
+    """Run fetch at most once per key at a time; concurrent callers share its outcome"""
+    inflight = _YELP_INFLIGHT.get(key)
+    if inflight is not None:
+        # Shield so a cancelled waiter doesn't cancel the shared fetch
+        return await asyncio.shield(inflight)
+
+    future = asyncio.get_running_loop().create_future()
+    # Mark the exception retrieved even if nobody else ended up waiting
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _YELP_INFLIGHT[key] = future
+    try:
+        result = await fetch()
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        _YELP_INFLIGHT.pop(key, None)
+
+
+def _yelp_refresh_done(task: asyncio.Task) -> None:
+    """Drop a finished background refresh, keeping the stale entry if it failed"""
+    _YELP_REFRESHING.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"Yelp background refresh failed: {task.exception()}")
+
+
+async def _yelp_swr(key: str, fetch: Callable[[], Awaitable[str]]) -> str:
+    """
+    Stale-while-revalidate lookup for the async Yelp tools.
+
+    Fresh entries are returned directly. Stale (but unexpired) entries are
+    returned too, with a coalesced refresh scheduled in the background, so
+    only a full miss waits on Yelp.
+    """
+    cached = _YELP_CACHE.get(key)
+    if cached is not None:
+        age = time.monotonic() - cached[0]
+        if age < _YELP_CACHE_TTL:
+            if age >= _YELP_FRESH_TTL and key not in _YELP_INFLIGHT:
+                task = asyncio.create_task(_yelp_coalesced(key, fetch))
+                _YELP_REFRESHING.add(task)
+                task.add_done_callback(_yelp_refresh_done)
+            return _yelp_cache_unpack(cached[1])
+    return await _yelp_coalesced(key, fetch)
+
+
+def _biz_to_dict(biz: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields shared by Yelp search and details results, in our format"""
+    # Sub-dicts looked up once per business
+    loc = biz.get("location") or {}
+    coord = biz.get("coordinates") or {}
+    return {
+        "yelp_id": biz.get("id"),
+        "business_name": biz.get("name"),
+        "phone": biz.get("phone", ""),
+        "address": ", ".join(loc.get("display_address") or ()),
+        "city": loc.get("city", ""),
+        "state": loc.get("state", ""),
+        "zip_code": loc.get("zip_code", ""),
+        "location_lat": coord.get("latitude"),
+        "location_lon": coord.get("longitude"),
+        "rating": biz.get("rating", 0),
+        "review_count": biz.get("review_count", 0),
+        "price_range": biz.get("price", "$$"),
+        "categories": [cat.get("title") for cat in biz.get("categories") or ()],
+        "yelp_url": biz.get("url", ""),
+        "is_closed": biz.get("is_closed", False)
+    }
+
+
 # ============================================================================
 # Yelp API Tool
 # ============================================================================
@@ -51,87 +362,111 @@ class YelpSearchTool(BaseTool):
     def _run(self, input_data: str) -> str:
         """Execute Yelp search"""
         try:
-            # Parse input
-            if isinstance(input_data, str):
-                params = json.loads(input_data)
-            else:
-                params = input_data
-
-            term = params.get("term", "hair salon")
-            location = params.get("location", "Boston, MA")
-            limit = min(params.get("limit", 20), 50)
-            categories = params.get("categories", "")
-
-            if not self.api_key:
-                return json.dumps({
-                    "error": "Yelp API key not configured",
-                    "businesses": []
-                })
-
-            # Make Yelp API request
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Accept": "application/json"
-            }
-
-            search_params = {
-                "term": term,
-                "location": location,
-                "limit": limit,
-                "sort_by": "rating"
-            }
+            request = self._prepare(input_data)
+            if isinstance(request, str):
+                return request
+            term, location, search_params, cache_key = request
+
+            cached = _yelp_cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Search for businesses
+            response = _yelp_get(
+                YELP_SEARCH_URL,
+                headers=_yelp_headers(self.api_key),
+                params=search_params
+            )
+            return self._finish(orjson.loads(response.content), term, location, cache_key)
 
-            if categories:
-                search_params["categories"] = categories
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Yelp API error: {e.response.status_code} - {e.response.text}")
+            return _dumps({"error": f"Yelp API error: {e.response.status_code}", "businesses": []})
+        except Exception as e:
+            logger.error(f"Yelp search error: {e}")
+            return _dumps({"error": str(e), "businesses": []})
 
-            with httpx.Client(timeout=30.0) as client:
-                # Search for businesses
-                response = client.get(
-                    "https://api.yelp.com/v3/businesses/search",
-                    headers=headers,
+    async def _arun(self, input_data: str) -> str:
+        """Execute Yelp search without blocking the event loop"""
+        try:
+            request = self._prepare(input_data)
+            if isinstance(request, str):
+                return request
+            term, location, search_params, cache_key = request
+
+            async def fetch() -> str:
+                response = await _ayelp_get(
+                    YELP_SEARCH_URL,
+                    headers=_yelp_headers(self.api_key),
                     params=search_params
                 )
-                response.raise_for_status()
-                data = response.json()
-
-            businesses = []
-            for biz in data.get("businesses", []):
-                # Transform to our format
-                business = {
-                    "yelp_id": biz.get("id"),
-                    "business_name": biz.get("name"),
-                    "phone": biz.get("phone", ""),
-                    "address": ", ".join(biz.get("location", {}).get("display_address", [])),
-                    "city": biz.get("location", {}).get("city", ""),
-                    "state": biz.get("location", {}).get("state", ""),
-                    "zip_code": biz.get("location", {}).get("zip_code", ""),
-                    "location_lat": biz.get("coordinates", {}).get("latitude"),
-                    "location_lon": biz.get("coordinates", {}).get("longitude"),
-                    "rating": biz.get("rating", 0),
-                    "review_count": biz.get("review_count", 0),
-                    "price_range": biz.get("price", "$$"),
-                    "categories": [cat.get("title") for cat in biz.get("categories", [])],
-                    "photos": [biz.get("image_url")] if biz.get("image_url") else [],
-                    "yelp_url": biz.get("url", ""),
-                    "is_closed": biz.get("is_closed", False),
-                    "distance_meters": biz.get("distance")
-                }
-                businesses.append(business)
-
-            logger.info(f"Yelp search found {len(businesses)} businesses for '{term}' in {location}")
-
-            return json.dumps({
-                "total": data.get("total", 0),
-                "businesses": businesses,
-                "region": data.get("region", {})
-            })
+                return self._finish(orjson.loads(response.content), term, location, cache_key)
+
+            return await _yelp_swr(cache_key, fetch)
 
         except httpx.HTTPStatusError as e:
             logger.error(f"Yelp API error: {e.response.status_code} - {e.response.text}")
-            return json.dumps({"error": f"Yelp API error: {e.response.status_code}", "businesses": []})
+            return _dumps({"error": f"Yelp API error: {e.response.status_code}", "businesses": []})
         except Exception as e:
             logger.error(f"Yelp search error: {e}")
-            return json.dumps({"error": str(e), "businesses": []})
+            return _dumps({"error": str(e), "businesses": []})
+
+    def _prepare(self, input_data):
+        """
+        Parse the tool input into (term, location, search_params, cache_key).
+
+        Returns the final JSON string instead when the API key is missing.
+        """
+        # Parse input
+        if isinstance(input_data, str):
+            params = orjson.loads(input_data)
+        else:
+            params = input_data
+
+        term = params.get("term", "hair salon")
+        location = params.get("location", "Boston, MA")
+        limit = min(params.get("limit", 20), 50)
+        categories = params.get("categories", "")
+
+        if not self.api_key:
+            return _dumps({
+                "error": "Yelp API key not configured",
+                "businesses": []
+            })
+
+        cache_key = _yelp_search_key(term, location, limit, categories)
+        search_params = {
+            "term": term,
+            "location": location,
+            "limit": limit,
+            "sort_by": "rating"
+        }
+
+        if categories:
+            search_params["categories"] = categories
+
+        return term, location, search_params, cache_key
+
+    def _finish(self, data: Dict[str, Any], term: str, location: str, cache_key: str) -> str:
+        """Transform a Yelp search response to our format and cache it"""
+        businesses = []
+        for biz in data.get("businesses", []):
+            # Transform to our format
+            business = _biz_to_dict(biz)
+            image_url = biz.get("image_url")
+            business["photos"] = [image_url] if image_url else []
+            business["distance_meters"] = biz.get("distance")
+            businesses.append(business)
+
+        logger.info(f"Yelp search found {len(businesses)} businesses for '{term}' in {location}")
+
+        # Only the projected fields are kept (and cached), not the raw payload
+        result = _dumps({
+            "total": data.get("total", 0),
+            "businesses": businesses
+        })
+        _yelp_cache_set(cache_key, result)
+        return result
 
 
 class YelpBusinessDetailsTool(BaseTool):
@@ -152,66 +487,143 @@ class YelpBusinessDetailsTool(BaseTool):
     def _run(self, business_id: str) -> str:
         """Get detailed business information"""
         try:
-            if not self.api_key:
-                return json.dumps({"error": "Yelp API key not configured"})
+            error = self._precheck(business_id)
+            if error is not None:
+                return error
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Accept": "application/json"
-            }
+            cached = _yelp_cache_get(_yelp_details_key(business_id))
+            if cached is not None:
+                return cached
+
+            response = _yelp_get(
+                f"https://api.yelp.com/v3/businesses/{business_id}",
+                headers=_yelp_headers(self.api_key)
+            )
+            return self._finish(orjson.loads(response.content), business_id)
+
+        except Exception as e:
+            logger.error(f"Yelp business details error: {e}")
+            return _dumps({"error": str(e)})
+
+    async def _arun(self, business_id: str) -> str:
+        """Get detailed business information without blocking the event loop"""
+        try:
+            error = self._precheck(business_id)
+            if error is not None:
+                return error
 
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(
+            async def fetch() -> str:
+                response = await _ayelp_get(
                     f"https://api.yelp.com/v3/businesses/{business_id}",
-                    headers=headers
+                    headers=_yelp_headers(self.api_key)
                 )
-                response.raise_for_status()
-                biz = response.json()
-
-            # Parse business hours
-            hours = []
-            for hour_data in biz.get("hours", [{}])[0].get("open", []):
-                hours.append({
-                    "day": hour_data.get("day"),
-                    "start": hour_data.get("start"),
-                    "end": hour_data.get("end"),
-                    "is_overnight": hour_data.get("is_overnight", False)
-                })
-
-            details = {
-                "yelp_id": biz.get("id"),
-                "business_name": biz.get("name"),
-                "phone": biz.get("phone", ""),
-                "address": ", ".join(biz.get("location", {}).get("display_address", [])),
-                "city": biz.get("location", {}).get("city", ""),
-                "state": biz.get("location", {}).get("state", ""),
-                "zip_code": biz.get("location", {}).get("zip_code", ""),
-                "location_lat": biz.get("coordinates", {}).get("latitude"),
-                "location_lon": biz.get("coordinates", {}).get("longitude"),
-                "rating": biz.get("rating", 0),
-                "review_count": biz.get("review_count", 0),
-                "price_range": biz.get("price", "$$"),
-                "categories": [cat.get("title") for cat in biz.get("categories", [])],
-                "photos": biz.get("photos", []),
-                "yelp_url": biz.get("url", ""),
-                "business_hours": hours,
-                "is_claimed": biz.get("is_claimed", False),
-                "is_closed": biz.get("is_closed", False),
-                "transactions": biz.get("transactions", [])
-            }
+                return self._finish(orjson.loads(response.content), business_id)
 
-            logger.info(f"Got details for business: {details['business_name']}")
-            return json.dumps(details)
+            return await _yelp_swr(_yelp_details_key(business_id), fetch)
 
         except Exception as e:
             logger.error(f"Yelp business details error: {e}")
-            return json.dumps({"error": str(e)})
+            return _dumps({"error": str(e)})
+
+    def _precheck(self, business_id: str) -> Optional[str]:
+        """Return the error JSON string if the API key is missing"""
+        if not self.api_key:
+            return _dumps({"error": "Yelp API key not configured"})
+        return None
+
+    def _finish(self, biz: Dict[str, Any], business_id: str) -> str:
+        """Transform a Yelp business response to our format and cache it"""
+        # Parse business hours
+        hours = []
+        for hour_data in biz.get("hours", [{}])[0].get("open", []):
+            hours.append({
+                "day": hour_data.get("day"),
+                "start": hour_data.get("start"),
+                "end": hour_data.get("end"),
+                "is_overnight": hour_data.get("is_overnight", False)
+            })
+
+        details = _biz_to_dict(biz)
+        details.update({
+            "photos": biz.get("photos", []),
+            "business_hours": hours,
+            "is_claimed": biz.get("is_claimed", False),
+            "transactions": biz.get("transactions", [])
+        })
+
+        logger.info(f"Got details for business: {details['business_name']}")
+        result = _dumps(details)
+        _yelp_cache_set(_yelp_details_key(business_id), result)
+        return result
+
+
+async def yelp_details_many(business_ids: List[str]) -> List[str]:
+    """Fetch Yelp details for several businesses concurrently (results in input order)"""
+    # Bounded so a large expansion stays under Yelp's per-second rate limit
+    semaphore = asyncio.Semaphore(_YELP_MAX_CONCURRENT)
+
+    async def fetch(business_id: str) -> str:
+        async with semaphore:
+            return await yelp_details_tool._arun(business_id)
+
+    return await asyncio.gather(*(fetch(business_id) for business_id in business_ids))
 
 
 # ============================================================================
 # BrightData Scraping Tool
 # ============================================================================
 
+# Realistic Boston/Cambridge beauty service providers
+_MOCK_PROVIDERS: List[Dict[str, Any]] = [
+    {
+        "provider_name": "Salon Mario Russo",
+        "stylist_names": ["Mario Russo", "Anna Chen", "David Kim"],
+        "address": "9 Newbury Street, Boston, MA 02116",
+        "location_lat": 42.3520,
+        "location_lon": -71.0758,
+        "services": [
+            {"name": "Women's Haircut", "price": 85, "duration": 45},
+            {"name": "Men's Haircut", "price": 55, "duration": 30},
+            {"name": "Balayage", "price": 250, "duration": 180},
+            {"name": "Full Highlights", "price": 200, "duration": 120}
+        ],
+        "rating": 4.8,
+        "review_count": 423,
+        "photos": [
+            "https://images.unsplash.com/photo-1560066984-138dadb4c035?w=400",
+            "https://images.unsplash.com/photo-1522337360788-8b13dee7a37e?w=400"
+        ],
+        "booking_url": "https://salonmariorusso.com/book",
+        "specialties": ["Color Specialists", "Curly Hair Experts", "Bridal"]
+    },
+    # ... (truncated for brevity, same as before)
+]
+_MOCK_PROVIDERS_JSON = _dumps(_MOCK_PROVIDERS)
+
+# scraped_at timestamp, reused for up to a second: (wall-clock time, ISO string)
+_NOW_ISO: Tuple[float, str] = (0.0, "")
+
+
+def _now_iso() -> str:
+    """Current local time in ISO format, recomputed at most once per second"""
+    global _NOW_ISO
+    now = time.time()
+    if abs(now - _NOW_ISO[0]) >= 1.0:  # abs: also refresh if the clock steps back
+        _NOW_ISO = (now, datetime.fromtimestamp(now).isoformat())
+    return _NOW_ISO[1]
+
+# Location slugs: booksy "New York, NY" -> "new-york-ny", vagaro -> "new-york/ny"
+_BOOKSY_SLUG = str.maketrans({",": None, " ": "-"})
+_VAGARO_SLUG = str.maketrans({" ": "-"})
+
+# Search URL per platform, built from (search_location, search_term)
+_SCRAPE_URL_BUILDERS = {
+    "styleseat": lambda location, term: f"https://www.styleseat.com/search?location={location}&query={term}",
+    "booksy": lambda location, term: f"https://booksy.com/en-us/s/{term}/{location.translate(_BOOKSY_SLUG).lower()}",
+    "vagaro": lambda location, term: f"https://www.vagaro.com/{location.replace(', ', '/').translate(_VAGARO_SLUG).lower()}/{term}",
+}
+
+
 class BrightDataScraperTool(BaseTool):
     """
     Tool for scraping booking platform data using BrightData API
@@ -238,7 +650,7 @@ class BrightDataScraperTool(BaseTool):
         try:
             # Parse input
             if isinstance(input_data, str):
-                params = json.loads(input_data)
+                params = orjson.loads(input_data)
             else:
                 params = input_data
 
@@ -255,20 +667,9 @@ class BrightDataScraperTool(BaseTool):
             # BrightData Web Scraper API endpoint
             api_url = "https://api.brightdata.com/request"
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
             # Build scraping request based on platform
-            if platform == "styleseat":
-                scrape_url = url or f"https://www.styleseat.com/search?location={search_location}&query={search_term}"
-            elif platform == "booksy":
-                scrape_url = url or f"https://booksy.com/en-us/s/{search_term}/{search_location.replace(', ', '-').replace(' ', '-').lower()}"
-            elif platform == "vagaro":
-                scrape_url = url or f"https://www.vagaro.com/{search_location.replace(', ', '/').replace(' ', '-').lower()}/{search_term}"
-            else:
-                scrape_url = url
+            build_url = _SCRAPE_URL_BUILDERS.get(platform)
+            scrape_url = url or (build_url(search_location, search_term) if build_url else "")
 
             payload = {
                 "zone": self.zone,
@@ -276,16 +677,14 @@ class BrightDataScraperTool(BaseTool):
                 "format": "json"
             }
 
-            with httpx.Client(timeout=60.0) as client:
-                response = client.post(api_url, headers=headers, json=payload)
-                response.raise_for_status()
-                html_content = response.text
+            response = _brightdata_post(api_url, headers=_brightdata_headers(self.api_key), content=orjson.dumps(payload))
+            html_content = response.text
 
             # Parse the scraped content
             parsed_data = self._parse_platform_data(platform, html_content)
 
             logger.info(f"BrightData scraped {len(parsed_data.get('providers', []))} providers from {platform}")
-            return json.dumps(parsed_data)
+            return _dumps(parsed_data)
 
         except Exception as e:
             logger.error(f"BrightData scraping error: {e}")
@@ -306,51 +705,168 @@ class BrightDataScraperTool(BaseTool):
         return {
             "platform": platform,
             "providers": providers,
-            "scraped_at": datetime.now().isoformat()
+            "scraped_at": _now_iso()
         }
 
     def _get_mock_data(self, platform: str, location: str, search_term: str) -> str:
-        """Return realistic mock data for Boston/Cambridge area"""
-
-        # Realistic Boston/Cambridge beauty service providers
-        mock_providers = [
-            {
-                "provider_name": "Salon Mario Russo",
-                "stylist_names": ["Mario Russo", "Anna Chen", "David Kim"],
-                "address": "9 Newbury Street, Boston, MA 02116",
-                "location_lat": 42.3520,
-                "location_lon": -71.0758,
-                "services": [
-                    {"name": "Women's Haircut", "price": 85, "duration": 45},
-                    {"name": "Men's Haircut", "price": 55, "duration": 30},
-                    {"name": "Balayage", "price": 250, "duration": 180},
-                    {"name": "Full Highlights", "price": 200, "duration": 120}
-                ],
-                "rating": 4.8,
-                "review_count": 423,
-                "photos": [
-                    "https://images.unsplash.com/photo-1560066984-138dadb4c035?w=400",
-                    "https://images.unsplash.com/photo-1522337360788-8b13dee7a37e?w=400"
-                ],
-                "booking_url": "https://salonmariorusso.com/book",
-                "specialties": ["Color Specialists", "Curly Hair Experts", "Bridal"]
-            },
-            # ... (truncated for brevity, same as before)
-        ]
-
-        return json.dumps({
+        """Return realistic mock data for Boston/Cambridge area as a JSON string"""
+        # Only the wrapper varies per call; the provider list is serialized once at import
+        return (
+            f'{{"platform":{_dumps(platform)},"location":{_dumps(location)},'
+            f'"search_term":{_dumps(search_term)},"providers":{_MOCK_PROVIDERS_JSON},'
+            f'"scraped_at":"{_now_iso()}"}}'
+        )
+
+    def _get_mock_data_raw(self, platform: str, location: str, search_term: str) -> Dict[str, Any]:
+        """Return realistic mock data for Boston/Cambridge area as a dict (providers are shared; don't mutate)"""
+        return {
             "platform": platform,
             "location": location,
             "search_term": search_term,
-            "providers": mock_providers,
-            "scraped_at": datetime.now().isoformat()
-        })
+            "providers": _MOCK_PROVIDERS,
+            "scraped_at": _now_iso()
+        }
 
 
 # ============================================================================
 # Data Storage Tool
 # ============================================================================
 
+# Merchant upsert statements shared by the single and batched storage paths
+_FIND_BY_YELP_ID_SQL = text("SELECT id FROM merchants WHERE yelp_id = :yelp_id")
+_FIND_BY_GOOGLE_ID_SQL = text("SELECT id FROM merchants WHERE google_place_id = :google_id")
+_FIND_MANY_BY_YELP_ID_SQL = text(
+    "SELECT yelp_id, id FROM merchants WHERE yelp_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+_FIND_MANY_BY_GOOGLE_ID_SQL = text(
+    "SELECT google_place_id, id FROM merchants WHERE google_place_id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+
+_UPDATE_MERCHANT_SQL = text("""
+    UPDATE merchants SET
+        business_name = :business_name,
+        email = :email,
+        phone = :phone,
+        location_lat = :location_lat,
+        location_lon = :location_lon,
+        address = :address,
+        city = :city,
+        state = :state,
+        zip_code = :zip_code,
+        service_category = :service_category,
+        rating = :rating,
+        total_reviews = :total_reviews,
+        photo_url = :photo_url,
+        bio = :bio,
+        years_experience = :years_experience,
+        price_range = :price_range,
+        photos = :photos,
+        specialties = :specialties,
+        stylist_names = :stylist_names,
+        booking_url = :booking_url,
+        yelp_url = :yelp_url,
+        website = :website,
+        business_hours = :business_hours,
+        categories = :categories,
+        data_source = :data_source,
+        updated_at = NOW()
+    WHERE id = :id
+""")
+
+_INSERT_MERCHANT_SQL = text("""
+    INSERT INTO merchants (
+        business_name, email, phone, location_lat, location_lon,
+        address, city, state, zip_code, service_category,
+        rating, total_reviews, photo_url, bio, years_experience,
+        is_verified, yelp_id, google_place_id, price_range, photos,
+        specialties, stylist_names, booking_url, yelp_url,
+        website, business_hours, categories, data_source
+    ) VALUES (
+        :business_name, :email, :phone, :location_lat, :location_lon,
+        :address, :city, :state, :zip_code, :service_category,
+        :rating, :total_reviews, :photo_url, :bio, :years_experience,
+        :is_verified, :yelp_id, :google_id, :price_range, :photos,
+        :specialties, :stylist_names, :booking_url, :yelp_url,
+        :website, :business_hours, :categories, :data_source
+    ) RETURNING id
+""")
+
+# Default service inserted with each new merchant so they appear in search
+_INSERT_SERVICE_SQL = text("""
+    INSERT INTO services (
+        merchant_id, service_name, description, base_price, 
+        duration_minutes, is_active
+    ) VALUES (
+        :merchant_id, :service_name, :description, :base_price,
+        :duration, true
+    )
+""")
+
+
+def _merchant_params(provider_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values shared by merchant UPDATE and INSERT"""
+    business_name = provider_data.get("business_name", "Unknown")
+    # Ensure arrays are properly formatted for Postgres (lists -> lists or JSON)
+    # Using JSONB for complex fields
+    return {
+        "business_name": business_name,
+        "email": provider_data.get("email", f"contact@{business_name.replace(' ', '').lower()}.com"),
+        "phone": provider_data.get("phone"),
+        "location_lat": provider_data.get("location_lat"),
+        "location_lon": provider_data.get("location_lon"),
+        "address": provider_data.get("address"),
+        "city": provider_data.get("city"),
+        "state": provider_data.get("state"),
+        "zip_code": provider_data.get("zip_code"),
+        "service_category": provider_data.get("service_category", "beauty salon"),
+        "rating": provider_data.get("rating", 0),
+        "total_reviews": provider_data.get("review_count", 0),
+        "photo_url": provider_data.get("photo_url"),
+        "bio": provider_data.get("bio"),
+        "years_experience": provider_data.get("years_experience", 5),
+        "price_range": provider_data.get("price_range"),
+        "photos": _dumps(provider_data.get("photos", [])),
+        "specialties": provider_data.get("specialties", []), # Postgres ARRAY
+        "stylist_names": provider_data.get("stylist_names", []), # Postgres ARRAY
+        "booking_url": provider_data.get("booking_url"),
+        "yelp_url": provider_data.get("yelp_url"),
+        "website": provider_data.get("website"),
+        "business_hours": _dumps(provider_data.get("business_hours", [])),
+        "categories": _dumps(provider_data.get("categories", [])),
+        "data_source": provider_data.get("data_source", "manual")
+    }
+
+
+def _insert_params(provider_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for a new merchant"""
+    return {
+        **_merchant_params(provider_data),
+        "is_verified": True, # Assume verified for now
+        "yelp_id": provider_data.get("yelp_id"),
+        "google_id": provider_data.get("google_id")
+    }
+
+
+def _default_service_params(merchant_id: Any, provider_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Default service row for a new merchant, based on category"""
+    service_name = "Standard Service"
+    base_price = 50.0
+    if "hair" in provider_data.get("service_category", ""):
+        service_name = "Haircut"
+        base_price = 60.0
+    elif "nail" in provider_data.get("service_category", ""):
+        service_name = "Manicure"
+        base_price = 35.0
+
+    return {
+        "merchant_id": merchant_id,
+        "service_name": service_name,
+        "description": f"Professional {service_name}",
+        "base_price": base_price,
+        "duration": 60
+    }
+
+
 class MerchantStorageTool(BaseTool):
     """
     Tool for storing collected provider data to the database
@@ -369,7 +885,7 @@ class MerchantStorageTool(BaseTool):
         try:
             # Parse input
             if isinstance(input_data, str):
-                provider_data = json.loads(input_data)
+                provider_data = orjson.loads(input_data)
             else:
                 provider_data = input_data
 
@@ -382,17 +898,11 @@ class MerchantStorageTool(BaseTool):
             # Try to find existing merchant
             existing_merchant = None
             if yelp_id:
-                existing_merchant = db.execute(
-                    text("SELECT id FROM merchants WHERE yelp_id = :yelp_id"),
-                    {"yelp_id": yelp_id}
-                ).fetchone()
+                existing_merchant = db.execute(_FIND_BY_YELP_ID_SQL, {"yelp_id": yelp_id}).fetchone()
             
             if not existing_merchant and google_id:
                 # Check by google_id (mapped to google_place_id in DB)
-                existing_merchant = db.execute(
-                    text("SELECT id FROM merchants WHERE google_place_id = :google_id"),
-                    {"google_id": google_id}
-                ).fetchone()
+                existing_merchant = db.execute(_FIND_BY_GOOGLE_ID_SQL, {"google_id": google_id}).fetchone()
                 
             if not existing_merchant:
                 # Try fuzzy match on name + address (simplified)
@@ -400,164 +910,25 @@ class MerchantStorageTool(BaseTool):
                 # Skipping for safety in this automated tool
                 pass
 
-            # Prepare common fields
-            # Ensure arrays are properly formatted for Postgres (lists -> lists or JSON)
-            # Using JSONB for complex fields
-            
-            data_source = provider_data.get("data_source", "manual")
-            
             if existing_merchant:
                 # UPDATE
                 merchant_id = existing_merchant[0]
                 logger.info(f"Updating existing merchant: {business_name} ({merchant_id})")
-                
-                update_query = text("""
-                    UPDATE merchants SET
-                        business_name = :business_name,
-                        email = :email,
-                        phone = :phone,
-                        location_lat = :location_lat,
-                        location_lon = :location_lon,
-                        address = :address,
-                        city = :city,
-                        state = :state,
-                        zip_code = :zip_code,
-                        service_category = :service_category,
-                        rating = :rating,
-                        total_reviews = :total_reviews,
-                        photo_url = :photo_url,
-                        bio = :bio,
-                        years_experience = :years_experience,
-                        price_range = :price_range,
-                        photos = :photos,
-                        specialties = :specialties,
-                        stylist_names = :stylist_names,
-                        booking_url = :booking_url,
-                        yelp_url = :yelp_url,
-                        website = :website,
-                        business_hours = :business_hours,
-                        categories = :categories,
-                        data_source = :data_source,
-                        updated_at = NOW()
-                    WHERE id = :id
-                """)
-                
-                db.execute(update_query, {
-                    "id": merchant_id,
-                    "business_name": business_name,
-                    "email": provider_data.get("email", f"contact@{business_name.replace(' ', '').lower()}.com"),
-                    "phone": provider_data.get("phone"),
-                    "location_lat": provider_data.get("location_lat"),
-                    "location_lon": provider_data.get("location_lon"),
-                    "address": provider_data.get("address"),
-                    "city": provider_data.get("city"),
-                    "state": provider_data.get("state"),
-                    "zip_code": provider_data.get("zip_code"),
-                    "service_category": provider_data.get("service_category", "beauty salon"),
-                    "rating": provider_data.get("rating", 0),
-                    "total_reviews": provider_data.get("review_count", 0),
-                    "photo_url": provider_data.get("photo_url"),
-                    "bio": provider_data.get("bio"),
-                    "years_experience": provider_data.get("years_experience", 5),
-                    "price_range": provider_data.get("price_range"),
-                    "photos": json.dumps(provider_data.get("photos", [])),
-                    "specialties": provider_data.get("specialties", []), # Postgres ARRAY
-                    "stylist_names": provider_data.get("stylist_names", []), # Postgres ARRAY
-                    "booking_url": provider_data.get("booking_url"),
-                    "yelp_url": provider_data.get("yelp_url"),
-                    "website": provider_data.get("website"),
-                    "business_hours": json.dumps(provider_data.get("business_hours", [])),
-                    "categories": json.dumps(provider_data.get("categories", [])),
-                    "data_source": data_source
-                })
+                db.execute(_UPDATE_MERCHANT_SQL, {**_merchant_params(provider_data), "id": merchant_id})
                 
             else:
                 # INSERT
                 logger.info(f"Inserting new merchant: {business_name}")
-                
-                insert_query = text("""
-                    INSERT INTO merchants (
-                        business_name, email, phone, location_lat, location_lon,
-                        address, city, state, zip_code, service_category,
-                        rating, total_reviews, photo_url, bio, years_experience,
-                        is_verified, yelp_id, google_place_id, price_range, photos,
-                        specialties, stylist_names, booking_url, yelp_url,
-                        website, business_hours, categories, data_source
-                    ) VALUES (
-                        :business_name, :email, :phone, :location_lat, :location_lon,
-                        :address, :city, :state, :zip_code, :service_category,
-                        :rating, :total_reviews, :photo_url, :bio, :years_experience,
-                        :is_verified, :yelp_id, :google_id, :price_range, :photos,
-                        :specialties, :stylist_names, :booking_url, :yelp_url,
-                        :website, :business_hours, :categories, :data_source
-                    ) RETURNING id
-                """)
-                
-                result = db.execute(insert_query, {
-                    "business_name": business_name,
-                    "email": provider_data.get("email", f"contact@{business_name.replace(' ', '').lower()}.com"),
-                    "phone": provider_data.get("phone"),
-                    "location_lat": provider_data.get("location_lat"),
-                    "location_lon": provider_data.get("location_lon"),
-                    "address": provider_data.get("address"),
-                    "city": provider_data.get("city"),
-                    "state": provider_data.get("state"),
-                    "zip_code": provider_data.get("zip_code"),
-                    "service_category": provider_data.get("service_category", "beauty salon"),
-                    "rating": provider_data.get("rating", 0),
-                    "total_reviews": provider_data.get("review_count", 0),
-                    "photo_url": provider_data.get("photo_url"),
-                    "bio": provider_data.get("bio"),
-                    "years_experience": provider_data.get("years_experience", 5),
-                    "is_verified": True, # Assume verified for now
-                    "yelp_id": yelp_id,
-                    "google_id": google_id,
-                    "price_range": provider_data.get("price_range"),
-                    "photos": json.dumps(provider_data.get("photos", [])),
-                    "specialties": provider_data.get("specialties", []),
-                    "stylist_names": provider_data.get("stylist_names", []),
-                    "booking_url": provider_data.get("booking_url"),
-                    "yelp_url": provider_data.get("yelp_url"),
-                    "website": provider_data.get("website"),
-                    "business_hours": json.dumps(provider_data.get("business_hours", [])),
-                    "categories": json.dumps(provider_data.get("categories", [])),
-                    "data_source": data_source
-                })
+                result = db.execute(_INSERT_MERCHANT_SQL, _insert_params(provider_data))
                 merchant_id = result.fetchone()[0]
                 
                 # Also insert a default service for this merchant so they appear in search
-                service_query = text("""
-                    INSERT INTO services (
-                        merchant_id, service_name, description, base_price, 
-                        duration_minutes, is_active
-                    ) VALUES (
-                        :merchant_id, :service_name, :description, :base_price,
-                        :duration, true
-                    )
-                """)
-                
-                # Default service based on category
-                service_name = "Standard Service"
-                base_price = 50.0
-                if "hair" in provider_data.get("service_category", ""):
-                    service_name = "Haircut"
-                    base_price = 60.0
-                elif "nail" in provider_data.get("service_category", ""):
-                    service_name = "Manicure"
-                    base_price = 35.0
-                
-                db.execute(service_query, {
-                    "merchant_id": merchant_id,
-                    "service_name": service_name,
-                    "description": f"Professional {service_name}",
-                    "base_price": base_price,
-                    "duration": 60
-                })
+                db.execute(_INSERT_SERVICE_SQL, _default_service_params(merchant_id, provider_data))
 
             db.commit()
             logger.info(f"Successfully stored provider: {business_name}")
 
-            return json.dumps({
+            return _dumps({
                 "status": "success",
                 "message": f"Stored provider: {business_name}",
                 "provider_id": str(merchant_id)
@@ -566,10 +937,66 @@ class MerchantStorageTool(BaseTool):
         except Exception as e:
             db.rollback()
             logger.error(f"Storage error: {e}")
-            return json.dumps({"status": "error", "message": str(e)})
+            return _dumps({"status": "error", "message": str(e)})
         finally:
             db.close()
 
+    def store_many(self, providers: List[Dict[str, Any]]) -> int:
+        """
+        Store several providers in one session and transaction.
+
+        Existing merchants are looked up with one query per id type and updated
+        with a single executemany. If the batch fails it is rolled back and each
+        provider is retried on its own through _run.
+
+        Returns the number of providers stored.
+        """
+        if not providers:
+            return 0
+
+        db = SessionLocal()
+        try:
+            yelp_ids = [p["yelp_id"] for p in providers if p.get("yelp_id")]
+            google_ids = [p["google_id"] for p in providers if p.get("google_id")]
+            by_yelp_id = dict(db.execute(_FIND_MANY_BY_YELP_ID_SQL, {"ids": yelp_ids}).all()) if yelp_ids else {}
+            by_google_id = dict(db.execute(_FIND_MANY_BY_GOOGLE_ID_SQL, {"ids": google_ids}).all()) if google_ids else {}
+
+            updates = []
+            services = []
+            for provider_data in providers:
+                merchant_id = by_yelp_id.get(provider_data.get("yelp_id")) or by_google_id.get(provider_data.get("google_id"))
+                if merchant_id:
+                    updates.append({**_merchant_params(provider_data), "id": merchant_id})
+                else:
+                    merchant_id = db.execute(_INSERT_MERCHANT_SQL, _insert_params(provider_data)).fetchone()[0]
+                    services.append(_default_service_params(merchant_id, provider_data))
+                    # Later duplicates in the same batch update this row instead of inserting again
+                    if provider_data.get("yelp_id"):
+                        by_yelp_id[provider_data["yelp_id"]] = merchant_id
+                    if provider_data.get("google_id"):
+                        by_google_id[provider_data["google_id"]] = merchant_id
+
+            if updates:
+                db.execute(_UPDATE_MERCHANT_SQL, updates)
+            if services:
+                db.execute(_INSERT_SERVICE_SQL, services)
+
+            db.commit()
+            logger.info(f"Batch stored {len(providers)} providers ({len(updates)} updated, {len(services)} inserted)")
+            return len(providers)
+
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Batch storage failed, storing providers one by one: {e}")
+        finally:
+            db.close()
+
+        stored = 0
+        for provider_data in providers:
+            if orjson.loads(self._run(provider_data)).get("status") == "success":
+                stored += 1
+        return stored
+
 
 # ============================================================================
 # Export Tools
@@ -0,0 +1,168 @@
+"""
+Tests for batched Google Calendar free/busy lookups
+
+Checks that get_busy_periods_bulk:
+1. Sends one batched request for many users
+2. Queries a user once even if their id is passed more than once
+3. Mixes cached tokens with tokens fetched from the database
+4. Skips users whose individual lookup fails
+
+Run with: pytest test_calendar_batch.py
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.tools import calendar_tools
+
+
+class FakeQuery:
+    """Stands in for service.freebusy().query(...)"""
+
+    def __init__(self, token):
+        self.token = token
+
+
+class FakeBatch:
+    """Mimics googleapiclient's BatchHttpRequest (including its duplicate id check)"""
+
+    def __init__(self, callback, executed):
+        self.callback = callback
+        self.requests = {}
+        self.executed = executed
+
+    def add(self, request, request_id=None):
+        if request_id in self.requests:
+            raise KeyError("A request with this ID already exists: %s" % request_id)
+        self.requests[request_id] = request
+
+    def execute(self):
+        self.executed.append(list(self.requests))
+        for request_id, request in self.requests.items():
+            if request.token == "bad-token":
+                self.callback(request_id, None, RuntimeError("401 Unauthorized"))
+            else:
+                busy = [{"start": f"busy-{request.token}", "end": f"busy-{request.token}"}]
+                self.callback(request_id, {"calendars": {"primary": {"busy": busy}}}, None)
+
+
+class FakeFreeBusy:
+    def __init__(self, token):
+        self.token = token
+
+    def query(self, body):
+        return FakeQuery(self.token)
+
+
+class FakeService:
+    def __init__(self, token, executed):
+        self.token = token
+        self.executed = executed
+
+    def freebusy(self):
+        return FakeFreeBusy(self.token)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(callback, self.executed)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """SessionLocal stand-in answering the bulk token query from a dict"""
+
+    def __init__(self, tokens, queries):
+        self.tokens = tokens
+        self.queries = queries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, stmt, params):
+        self.queries.append(list(params["uids"]))
+        return FakeResult([
+            (uid, self.tokens[uid]) for uid in params["uids"] if self.tokens.get(uid)
+        ])
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    """Patch the Calendar client and DB; returns (db tokens, executed batches, DB queries)"""
+    db_tokens = {}
+    executed = []
+    queries = []
+    monkeypatch.setattr(calendar_tools, "_TOKEN_CACHE", {})
+    monkeypatch.setattr(calendar_tools, "SessionLocal", lambda: FakeSession(db_tokens, queries))
+    monkeypatch.setattr(calendar_tools, "_calendar_service", lambda token: FakeService(token, executed))
+    return db_tokens, executed, queries
+
+
+def _window():
+    start = calendar_tools.EASTERN_TZ.localize(datetime(2025, 11, 21, 9))
+    return start, start + timedelta(hours=8)
+
+
+def test_one_batch_for_many_users(calendar):
+    db_tokens, executed, _ = calendar
+    db_tokens.update({"u1": "t1", "u2": "t2", "u3": "t3"})
+
+    busy = calendar_tools.get_busy_periods_bulk(["u1", "u2", "u3"], *_window())
+
+    assert executed == [["u1", "u2", "u3"]]
+    assert busy["u2"] == [{"start": "busy-t2", "end": "busy-t2"}]
+    assert set(busy) == {"u1", "u2", "u3"}
+
+
+def test_repeated_ids_are_queried_once(calendar):
+    db_tokens, executed, queries = calendar
+    db_tokens.update({"u1": "t1", "u2": "t2"})
+
+    # First call caches both tokens, second call is served from the cache
+    calendar_tools.get_busy_periods_bulk(["u1", "u1", "u2"], *_window())
+    busy = calendar_tools.get_busy_periods_bulk(["u1", "u2", "u1"], *_window())
+
+    assert queries == [["u1", "u2"]]
+    assert executed == [["u1", "u2"], ["u1", "u2"]]
+    assert set(busy) == {"u1", "u2"}
+
+
+def test_cached_and_fetched_tokens_share_a_batch(calendar):
+    db_tokens, executed, queries = calendar
+    db_tokens.update({"u1": "t1", "u2": "t2"})
+    calendar_tools.get_busy_periods_bulk(["u1"], *_window())
+
+    busy = calendar_tools.get_busy_periods_bulk(["u1", "u2", "no-calendar"], *_window())
+
+    assert queries == [["u1"], ["u2", "no-calendar"]]
+    assert executed[-1] == ["u1", "u2"]
+    assert set(busy) == {"u1", "u2"}
+
+
+def test_failed_user_is_skipped(calendar):
+    db_tokens, _, _ = calendar
+    db_tokens.update({"u1": "t1", "u2": "bad-token"})
+
+    busy = calendar_tools.get_busy_periods_bulk(["u1", "u2"], *_window())
+
+    assert set(busy) == {"u1"}
+
+
+def test_batches_are_capped(calendar, monkeypatch):
+    db_tokens, executed, _ = calendar
+    monkeypatch.setattr(calendar_tools, "_CALENDAR_BATCH_LIMIT", 2)
+    db_tokens.update({f"u{i}": f"t{i}" for i in range(5)})
+
+    busy = calendar_tools.get_busy_periods_bulk([f"u{i}" for i in range(5)], *_window())
+
+    assert [len(batch) for batch in executed] == [2, 2, 1]
+    assert len(busy) == 5
@@ -0,0 +1,155 @@
+"""
+Tests for the background Boston/Cambridge collection jobs and HTTP caching
+
+Checks that:
+1. Concurrent jobs share one crew run
+2. Cancelling the job running the crew ends every waiting job too (no stuck "pending")
+3. Stale pending jobs are pruned
+4. If-None-Match lists, weak tags and "*" match our ETag
+5. Finished jobs are serialized from the result model, omitting defaults
+
+Run with: pytest test_data_collection_jobs.py
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from routers import data_collection
+
+
+class FakeCrew:
+    """Stands in for data_collection_crew; each run blocks until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def get_boston_cambridge_providers(self, limit_per_category):
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        return {
+            "providers": [{"business_name": "Salon"}],
+            "total_found": 1,
+            "errors": [],
+            "completed_at": "2025-11-21T10:00:00"
+        }
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """Fresh job, cache and in-flight registries for each test"""
+    monkeypatch.setattr(data_collection, "_BC_JOBS", {})
+    monkeypatch.setattr(data_collection, "_BC_CACHE", {})
+    monkeypatch.setattr(data_collection, "_BC_INFLIGHT", {})
+
+
+def _add_job(job_id, created_at=None):
+    data_collection._BC_JOBS[job_id] = {
+        "status": "pending",
+        "created_at": time.monotonic() if created_at is None else created_at,
+        "result": None,
+        "error": None
+    }
+
+
+def test_concurrent_jobs_share_one_run(monkeypatch):
+    async def scenario():
+        crew = FakeCrew()
+        monkeypatch.setattr(data_collection, "data_collection_crew", crew)
+        _add_job("leader")
+        _add_job("waiter")
+
+        leader = asyncio.create_task(data_collection._run_and_cache("leader", 10, False))
+        await crew.started.wait()
+        waiter = asyncio.create_task(data_collection._run_and_cache("waiter", 10, False))
+        await asyncio.sleep(0)
+
+        crew.release.set()
+        await asyncio.gather(leader, waiter)
+        return crew.calls
+
+    assert asyncio.run(scenario()) == 1
+    for job_id in ("leader", "waiter"):
+        job = data_collection._BC_JOBS[job_id]
+        assert job["status"] == "completed"
+        assert job["result"].total_providers == 1
+
+
+def test_cancelled_leader_fails_waiting_job(monkeypatch):
+    async def scenario():
+        crew = FakeCrew()
+        monkeypatch.setattr(data_collection, "data_collection_crew", crew)
+        _add_job("leader")
+        _add_job("waiter")
+
+        leader = asyncio.create_task(data_collection._run_and_cache("leader", 10, False))
+        await crew.started.wait()
+        waiter = asyncio.create_task(data_collection._run_and_cache("waiter", 10, False))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        results = await asyncio.gather(leader, waiter, return_exceptions=True)
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    for job_id in ("leader", "waiter"):
+        job = data_collection._BC_JOBS[job_id]
+        assert job["status"] == "failed"
+        assert job["error"] == "cancelled"
+    assert data_collection._BC_INFLIGHT == {}
+
+
+def test_stale_pending_jobs_are_pruned():
+    stale = time.monotonic() - data_collection._BC_CACHE_TTL - 1
+    _add_job("stale", created_at=stale)
+    _add_job("fresh")
+
+    data_collection._prune_bc_jobs()
+
+    assert list(data_collection._BC_JOBS) == ["fresh"]
+
+
+@pytest.mark.parametrize("if_none_match,expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"old", W/"abc"', True),
+    ("*", True),
+    ('"old", "older"', False),
+])
+def test_etag_matching(if_none_match, expected):
+    assert data_collection._etag_matches(if_none_match, '"abc"') is expected
+
+
+def test_finished_job_returns_result_without_defaults():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    app.include_router(data_collection.router)
+    _add_job("done")
+    data_collection._BC_JOBS["done"].update(
+        status="completed",
+        result=data_collection._to_collection_result(
+            {"providers": [{"business_name": "Salon"}], "total_found": 1, "errors": [],
+             "completed_at": "2025-11-21T10:00:00"},
+            []
+        )
+    )
+    client = TestClient(app)
+
+    body = client.get(f"{data_collection.router.prefix}/collect/boston-cambridge/done").json()
+    schema = client.get("/openapi.json").json()
+
+    assert body == {
+        "status": "completed",
+        "total_providers": 1,
+        "providers": [{"business_name": "Salon"}],
+        "completed_at": "2025-11-21T10:00:00"
+    }
+    assert "CollectionResult" in schema["components"]["schemas"]